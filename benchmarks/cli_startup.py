@@ -0,0 +1,47 @@
+"""
+Benchmark the startup time of the grambank command.
+
+Usage:
+
+    python benchmarks/cli_startup.py [--repos PATH] [--runs N]
+
+Reports the best and median wall clock time of running `grambank --help` and
+`grambank check --filename SHEET` in a fresh interpreter - i.e. including all imports.
+"""
+import sys
+import time
+import pathlib
+import argparse
+import statistics
+import subprocess
+
+TESTS = pathlib.Path(__file__).resolve().parent.parent / 'tests'
+
+
+def timeit(cmd, runs):
+    res = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        res.append(time.perf_counter() - start)
+    return min(res), statistics.median(res)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repos', type=pathlib.Path, default=TESTS / 'repos')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    sheet = sorted(args.repos.joinpath('original_sheets').glob('*.tsv'))[0]
+    grambank = [sys.executable, '-m', 'pygrambank', '--repos', str(args.repos)]
+    for name, cmd in [
+        ('grambank --help', grambank + ['--help']),
+        ('grambank check --filename', grambank + ['check', '--filename', str(sheet)]),
+    ]:
+        best, median = timeit(cmd, args.runs)
+        print('{:<30}best {:.3f}s\tmedian {:.3f}s'.format(name, best, median))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark the merging of conflict sheets for synthetic languages with many sheets.
+
+Usage:
+
+    python benchmarks/conflict_sheet.py [--features N] [--sheets N [N ...]] [--runs N]
+
+For each number of sheets, a language is coded by that many sheets for all features - with
+random values, thus with conflicts for most features - and a conflict sheet is created from
+scratch and then merged with a re-coded version of the sheets. Reports the best wall clock time
+of `pygrambank.conflicts.make_conflict_sheet` for both steps.
+"""
+import copy
+import time
+import random
+import argparse
+
+from pygrambank.conflicts import PotentialConflict, make_conflict_sheet
+
+
+def potential_conflicts(nfeatures, nsheets, rnd):
+    res = []
+    for i in range(nsheets):
+        sheet = 'C{}_abcd1234'.format(i)
+        for j in range(nfeatures):
+            res.append(PotentialConflict(
+                sheet_row={
+                    'Feature_ID': 'GB{:03d}'.format(j),
+                    'Value': rnd.choice('01?'),
+                    'Source': 'Author {}'.format(i),
+                    'Comment': '',
+                    'Contributed_Datapoint': 'C{}'.format(i),
+                },
+                sheet_name=sheet,
+                warnings=''))
+    return res
+
+
+def timeit(old_conflicts, rows, runs):
+    res = []
+    for _ in range(runs):
+        # `make_conflict_sheet` mutates the rows, so each run gets fresh copies:
+        args = copy.deepcopy((old_conflicts, rows))
+        start = time.perf_counter()
+        make_conflict_sheet(*args)
+        res.append(time.perf_counter() - start)
+    return min(res)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--features', type=int, default=200)
+    parser.add_argument('--sheets', type=int, nargs='+', default=[2, 10, 25, 50, 100])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    for nsheets in args.sheets:
+        rows = potential_conflicts(args.features, nsheets, rnd)
+        old = make_conflict_sheet([], copy.deepcopy(rows))
+        recoded = potential_conflicts(args.features, nsheets, rnd)
+        new, merge = timeit([], rows, args.runs), timeit(old, recoded, args.runs)
+        print('{:>4} sheets\t{:>6} rows\tnew {:.3f}s\tmerge {:.3f}s'.format(
+            nsheets, len(rows), new, merge))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,11 @@
 import sys
 from pathlib import Path
 
-from clldutils.clilib import ParserError, register_subcommands, get_parser_and_subparsers
+from clldutils.clilib import ParserError, get_parser_and_subparsers
 from clldutils.loglib import Logging
 
 from pygrambank.api import Grambank
+from pygrambank.cli_util import register_commands
 
 
 def main(args=None, catch_all=False, parsed_args=None):
@@ -13,14 +14,22 @@ def main(args=None, catch_all=False, parsed_args=None):
     parser, subparsers = get_parser_and_subparsers('grambank')
     parser.add_argument(
         '--repos', help="clone of glottobank/Grambank", default=Path('.'), type=Path)
-    register_subcommands(subparsers, pygrambank.commands)
+    parser.add_argument(
+        '--cache',
+        help="Cache parsed sheets, validation results and bibliography data in "
+             "<repos>/.grambank-cache",
+        default=False,
+        action='store_true')
+    register_commands(
+        parser, subparsers, pygrambank.commands, sys.argv[1:] if args is None else args)
 
     args = parsed_args or parser.parse_args(args=args)
     if not hasattr(args, "main"):  # pragma: no cover
         parser.print_help()
         return 1
 
-    args.repos = Grambank(args.repos, wiki=getattr(args, 'wiki_repos', None))
+    args.repos = Grambank(
+        args.repos, wiki=getattr(args, 'wiki_repos', None), cache=args.cache)
     with Logging(args.log, level=args.log_level):
         try:
             return args.main(args) or 0
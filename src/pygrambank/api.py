@@ -1,22 +1,42 @@
 from itertools import chain
 
+import attr
 from csvw.dsv import reader
 from clldutils.apilib import API
 from clldutils.misc import lazyproperty
 from clldutils import jsonlib
-from pyglottolog.references.bibfiles import BibFile
 
 from pygrambank.features import GB20
 from pygrambank.contributors import Contributors
-from pygrambank.sheet import Sheet
-from pygrambank.issues import Issue
+from pygrambank.sheet import Sheet, ValidationTable, VALUE_COLUMNS
+from pygrambank.cache import CACHE_DIR, SheetCache, fingerprint, memoized
+from pygrambank.matrix import ValueMatrix
+from pygrambank.util import iterunique, adhoc_merge
 
 
 class Grambank(API):
-    def __init__(self, repos, wiki=None):
+    def __init__(self, repos, wiki=None, cache=False):
+        """
+        :param repos: Path to a clone of glottobank/Grambank.
+        :param wiki: Path to a clone of grambank/grambank.wiki.
+        :param cache: Flag signaling whether to cache parsed sheets, validation results and \
+        bibliography data in `cache_dir`.
+        """
         API.__init__(self, repos)
         self.wiki = wiki or self.repos.resolve().parent / 'grambank.wiki'
         self.gb20 = GB20(self.path('gb20.txt'))
+        self.cache = cache
+
+    @property
+    def cache_dir(self):
+        return self.repos / CACHE_DIR
+
+    @lazyproperty
+    def sheet_cache(self):
+        if self.cache:
+            return SheetCache(
+                self.cache_dir / 'sheets',
+                lambda: fingerprint(self.gb20.path, self.wiki))
 
     @property
     def sheets_dir(self):
@@ -26,7 +46,11 @@ class Grambank(API):
     def quarantine_dir(self):
         return self.repos / 'quarantine'
 
-    def iter_sheets(self, quarantined=True):
+    def iter_sheets(self, quarantined=True, columns=None):
+        """
+        :param columns: Optional collection of column names to restrict the rows of the sheets \
+        to, e.g. `pygrambank.sheet.VALUE_COLUMNS` - see `Sheet.iterrows`.
+        """
         if quarantined and self.quarantine_dir.exists():
             sheet_files = chain(
                 self.sheets_dir.iterdir(),
@@ -35,7 +59,29 @@ class Grambank(API):
             sheet_files = self.sheets_dir.iterdir()
         for p in sorted(sheet_files, key=lambda i: i.stem):
             if p.is_file() and p.name not in ['.gitattributes', '.DS_Store']:
-                yield Sheet(p)
+                yield Sheet(p, cache=self.sheet_cache, columns=columns)
+
+    def value_matrix(self, quarantined=True, conflicts_dir=None):
+        """
+        Load the values of the selected sheets - i.e. one sheet per language, as in
+        `grambank check` - into a `ValueMatrix`.
+
+        :param conflicts_dir: Directory with conflict sheets `<glottocode>.tsv`. If given, values \
+        for languages with (mergeable) conflict sheets are selected with `adhoc_merge`.
+        """
+        sheets = [
+            (s, list(s.itervalues(self)))
+            for s in self.iter_sheets(quarantined=quarantined, columns=VALUE_COLUMNS)]
+        selected = {s.glottocode: (s, values) for s, values in iterunique(sheets)}
+        if conflicts_dir:
+            for gc in selected:
+                conflicts = conflicts_dir / '{}.tsv'.format(gc)
+                if conflicts.exists():
+                    merged = adhoc_merge(
+                        self, gc, list(reader(conflicts, dicts=True, delimiter='\t')))
+                    if merged:
+                        selected[gc] = (merged[0], [attr.asdict(r) for r in merged[1]])
+        return ValueMatrix.from_sheets(selected.values(), self.features)
 
     @property
     def exclude(self):
@@ -49,6 +95,8 @@ class Grambank(API):
 
     @lazyproperty
     def bib(self):
+        from pyglottolog.references.bibfiles import BibFile
+
         return {e.key: (e.type, e.fields) for e in BibFile(self.repos / 'gb.bib').iterentries()}
 
     @lazyproperty
@@ -57,8 +105,32 @@ class Grambank(API):
 
     @lazyproperty
     def features(self):
+        if self.cache:
+            return self.gb20.read_features(self.wiki, catalogue=self.feature_catalogue())
         return self.gb20.read_features(self.wiki)
 
+    def feature_catalogue(self, rebuild=False):
+        """
+        Retrieve the compiled feature catalogue from the cache - or compile it, and cache it if
+        `cache` is set.
+
+        The catalogue is keyed with a fingerprint of gb20.txt and the wiki pages.
+        """
+        if not self.cache:
+            return self.gb20.read_features(self.wiki).catalogue()
+        directory = self.cache_dir / 'features'
+        if rebuild and directory.exists():
+            for p in directory.glob('*.pickle'):
+                p.unlink()
+        return memoized(
+            directory,
+            fingerprint(self.gb20.path, self.wiki),
+            lambda: self.gb20.read_features(self.wiki).catalogue())
+
+    @lazyproperty
+    def validation_table(self):
+        return ValidationTable.from_features(self.features)
+
     @lazyproperty
     def issues_path(self):
         return self.path('archived_discussions', 'issues.json')
@@ -69,6 +141,8 @@ class Grambank(API):
 
     @lazyproperty
     def issues(self):
+        from pygrambank.issues import Issue
+
         issues = jsonlib.load(self.issues_path)
         comments = jsonlib.load(self.comments_path)
         return [Issue(issue, comments.get(str(issue['number']), [])) for issue in issues]
@@ -1,4 +1,5 @@
 import re
+import functools
 
 AUTHOR_PATTERNS = [
     re.compile(p) for p in [
@@ -211,22 +212,27 @@ def prioritised_bibkeys(bibkeys, bibliography_entries):
     return prioritised_bibkeys
 
 
+UNPUBLISHED_MARKERS = [
+    'p.c',
+    'personal communication',
+    'pers comm',
+    'pers. comm',
+    'ieldnotes',
+    'ield notes',
+    'forth',
+    'Forth',
+    'ubmitted',
+    'o appear',
+    'in press',
+    'in prep',
+    'in prog',
+]
+REGEX_UNPUBLISHED = re.compile(
+    '|'.join(['^http'] + [re.escape(marker) for marker in UNPUBLISHED_MARKERS]))
+
+
 def is_unpublished(source_string):
-    return (
-        'p.c' in source_string
-        or 'personal communication' in source_string
-        or 'pers comm' in source_string
-        or 'pers. comm' in source_string
-        or 'ieldnotes' in source_string
-        or 'ield notes' in source_string
-        or 'forth' in source_string
-        or 'Forth' in source_string
-        or 'ubmitted' in source_string
-        or 'o appear' in source_string
-        or 'in press' in source_string
-        or 'in prep' in source_string
-        or 'in prog' in source_string
-        or source_string.startswith('http'))
+    return bool(REGEX_UNPUBLISHED.search(source_string))
 
 
 def mismatch_is_fatal(source_string):
@@ -244,15 +250,20 @@ def mismatch_is_fatal(source_string):
         or is_unpublished(source_string))
 
 
-def iter_authoryearpages(source_string):
+# Maximal number of distinct `Source` strings for which the parsed citations are cached:
+CITATION_CACHE_SIZE = 2 ** 16
+
+
+@functools.lru_cache(maxsize=CITATION_CACHE_SIZE)
+def parse_citations(source_string):
     """Parse the `Source` field of a data sheet.
 
-    Returns an iterator of tuples with the following components:
-     * Author name
-     * Year of publication
-     * Page number
-     * Word from title
+    Since identical `Source` strings are used for many rows, results are cached.
+    Cache statistics are available via `parse_citations.cache_info()`.
+
+    Returns a tuple of tuples with the components described in `iter_authoryearpages`.
     """
+    res = []
     for citation_string in source_string.replace("), ", "); ").split(";"):
         if is_unpublished(citation_string):
             continue
@@ -277,4 +288,17 @@ def iter_authoryearpages(source_string):
                 author = author[:wft]
             else:
                 word_from_title = ''
-            yield (author, year, pages.strip() if pages else pages, word_from_title)
+            res.append((author, year, pages.strip() if pages else pages, word_from_title))
+    return tuple(res)
+
+
+def iter_authoryearpages(source_string):
+    """Parse the `Source` field of a data sheet.
+
+    Returns an iterator of tuples with the following components:
+     * Author name
+     * Year of publication
+     * Page number
+     * Word from title
+    """
+    return iter(parse_citations(source_string))
@@ -0,0 +1,200 @@
+"""
+On-disk caches for data derived from the files in a Grambank repository.
+
+Cache entries are stored as pickles below a cache directory (by default `.grambank-cache/` in the
+repository) and are invalidated when the files they were derived from change - or the code which
+derived them.
+"""
+import os
+import pickle
+import hashlib
+import pathlib
+import functools
+
+from clldutils.path import md5
+
+__all__ = ['CACHE_DIR', 'fingerprint', 'version', 'memoized', 'SheetCache']
+
+CACHE_DIR = '.grambank-cache'
+# Must be incremented when the structure of cache entries changes:
+CACHE_FORMAT = 1
+
+
+def _stat(p):
+    st = p.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def fingerprint(*paths, recursive=False):
+    """
+    Compute a fingerprint of the state of a set of files and directories.
+
+    Files contribute their content hash, directories the name, size and mtime of the files they
+    contain - which is a lot cheaper than reading all of them.
+
+    :param recursive: Flag signaling whether to include files in subdirectories of directories.
+    """
+    res = hashlib.md5()
+    for p in paths:
+        res.update(str(p).encode('utf8'))
+        if p.is_file():
+            res.update(md5(p).encode('ascii'))
+        elif p.is_dir():
+            for pp in sorted(p.rglob('*') if recursive else p.iterdir()):
+                if pp.is_file():
+                    res.update('{}:{}:{}'.format(
+                        pp.relative_to(p).as_posix(), *_stat(pp)).encode('utf8'))
+    return res.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def version():
+    """
+    Compute the version of cached data.
+
+    Cached data does not only depend on the files it was derived from, but also on the code which
+    derived it (e.g. the rules in `pygrambank.dependencies`) and on the classes of the pickled
+    objects. Thus, the version combines the cache format with the pygrambank version and the
+    size and mtime of the pygrambank source files.
+    """
+    from pygrambank import __version__
+
+    res = hashlib.md5('{}:{}'.format(CACHE_FORMAT, __version__).encode('utf8'))
+    src = pathlib.Path(__file__).parent
+    for p in sorted(src.rglob('*.py')):
+        res.update('{}:{}:{}'.format(p.relative_to(src).as_posix(), *_stat(p)).encode('utf8'))
+    return res.hexdigest()
+
+
+def load(p):
+    """
+    Read a pickled object from `p`.
+
+    :return: The object or `None`, if `p` does not exist or cannot be unpickled - e.g. because it \
+    was written by an incompatible version of pygrambank.
+    """
+    try:
+        with p.open('rb') as fp:
+            return pickle.load(fp)
+    except Exception:  # Any problem reading the cache is a cache miss.
+        return None
+
+
+def memoized(directory, key, func):
+    """
+    Retrieve the result of calling `func` from the cache - or call `func` and cache the result.
+
+    Since `directory` holds the results of one function only, results cached for other keys -
+    i.e. for outdated inputs - are removed when a new result is cached.
+
+    :param key: `str` identifying the inputs of `func` - to which the cache `version` is added.
+    """
+    p = directory / '{}-{}.pickle'.format(key, version())
+    res = load(p)
+    if res is None:
+        res = func()
+        dump(res, p)
+        for stale in directory.glob('*.pickle'):
+            if stale != p:
+                stale.unlink()
+    return res
+
+
+def dump(obj, p):
+    """
+    Write the pickled `obj` to `p`, atomically - so that concurrent readers never see a partial
+    file.
+    """
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.parent / '{}.{}.tmp'.format(p.name, os.getpid())
+    with tmp.open('wb') as fp:
+        pickle.dump(obj, fp, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(p)
+
+
+class SheetCache(object):
+    """
+    Cache for the rows of sheets and for the results of validating them.
+
+    Rows are valid as long as the sheet file is unchanged (as determined by size and mtime, or -
+    if these changed - by the md5 hash of the content) and the cache `version` is the same.
+    Validation results are additionally keyed with a fingerprint of the feature specifications
+    they were computed against.
+    """
+    def __init__(self, directory, fingerprint):
+        self.directory = directory
+        self._fingerprint = fingerprint
+        self._entries = {}
+
+    @property
+    def fingerprint(self):
+        if callable(self._fingerprint):
+            self._fingerprint = self._fingerprint()
+        return self._fingerprint
+
+    def _path(self, sheet):
+        return self.directory / sheet.path.parent.name / '{}.pickle'.format(sheet.path.name)
+
+    def _entry(self, sheet):
+        """
+        Retrieve the up-to-date cache entry for a sheet, or `None`.
+        """
+        if sheet.path in self._entries:
+            entry = self._entries[sheet.path]
+            # The sheet may have been changed since we read or wrote the entry:
+            if entry is None or entry['stat'] == _stat(sheet.path):
+                return entry
+        else:
+            entry = load(self._path(sheet))
+            if entry and entry.get('version') != version():
+                entry = None
+        if entry:
+            stat = _stat(sheet.path)
+            if entry['stat'] != stat:
+                if entry['md5'] != md5(sheet.path):
+                    entry = None
+                else:  # Only the mtime changed, e.g. because the file was checked out again.
+                    entry['stat'] = stat
+                    dump(entry, self._path(sheet))
+        self._entries[sheet.path] = entry
+        return entry
+
+    def invalidate(self, sheet):
+        """
+        Make sure the cache entry for a sheet is re-validated, e.g. after the sheet was written.
+        """
+        self._entries.pop(sheet.path, None)
+
+    def rows(self, sheet):
+        entry = self._entry(sheet)
+        return entry['rows'] if entry else None
+
+    def set_rows(self, sheet, rows):
+        self._entries[sheet.path] = entry = dict(
+            stat=_stat(sheet.path),
+            md5=md5(sheet.path),
+            version=version(),
+            rows=rows,
+            fingerprint=None)
+        dump(entry, self._path(sheet))
+
+    def get(self, sheet, key):
+        """
+        Retrieve a validation result for a sheet.
+        """
+        entry = self._entry(sheet)
+        if entry and entry['fingerprint'] == self.fingerprint:
+            return entry.get(key)
+
+    def set(self, sheet, key, value):
+        entry = self._entry(sheet)
+        if entry is None:  # pragma: no cover
+            return
+        if entry['fingerprint'] != self.fingerprint:
+            # Validation results computed against other feature specs are stale:
+            for k in list(entry):
+                if k not in ['stat', 'md5', 'version', 'rows']:
+                    del entry[k]
+            entry['fingerprint'] = self.fingerprint
+        entry[key] = value
+        dump(entry, self._path(sheet))
@@ -1,13 +1,24 @@
 import collections
 from itertools import groupby
 import re
+import json
+import time
+import pathlib
+import subprocess
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 
+import attr
 import pyglottolog
+from pyglottolog.languoids import Glottocode
 from clldutils.misc import lazyproperty
+from clldutils.path import walk
+from clldutils.inifile import INI
 from pycldf.sources import Source
 
 from pygrambank import bib
+from pygrambank.cache import fingerprint
+from pygrambank.tree import TreeIndex, DescendantsMap, InheritedBibkeys
 
 
 MANUAL_SOURCE_MATCHES = {
@@ -37,6 +48,89 @@ def clean_bibkey(key):
     return key.replace(':', '_').replace("'", "")
 
 
+# Lengths of the year strings in citations, as matched by `bib.PARTIAL_REGEX_YEAR`:
+YEAR_LENGTHS = (2, 4, 7)
+REGEX_NAME_TOKEN_SEPARATOR = re.compile(r'[\s,.\-]+')
+
+
+def _substrings(s, lengths):
+    return {s[i:i + n] for n in lengths for i in range(len(s) - n + 1)}
+
+
+class BibliographyIndex:
+    """Index of the bibliography entries associated with a glottocode.
+
+    For each glottocode, bibliography entries are indexed by the tokens of
+    the authors' family names and by the substrings of the `year` field which
+    could match the year of a citation.  Thus, looking up the candidate
+    entries for a citation is a dict lookup rather than a scan over all
+    entries for the glottocode.
+
+    Indexes for glottocodes are built lazily, when first needed, and can be
+    shared between `BibliographyMatcher` instances.
+    """
+
+    def __init__(self, bibliography_entries, bibkeys_by_glottocode):
+        self.bibliography_entries = bibliography_entries
+        self.bibkeys_by_glottocode = bibkeys_by_glottocode
+        self._by_glottocode = {}
+
+        # Note: Caching the family names of the authors because parsing them
+        # turned out to be quite expensive.
+        self._parsed_author_cache = {}
+
+    def parse_authors(self, bibkey):
+        """Return set of family names of authors for a bibkey (cached)."""
+        if bibkey in self._parsed_author_cache:
+            return self._parsed_author_cache[bibkey]
+        else:
+            bibentry = self.bibliography_entries[bibkey][1]
+            bibauthors = bibentry.get('author') or bibentry.get('editor') or ''
+            family_names = {
+                undiacritic(x['lastname'])
+                for x in bib.parse_authors(bibauthors)}
+            family_names.update(bib.bibkey_authors(bibkey))
+            self._parsed_author_cache[bibkey] = family_names
+            return family_names
+
+    def _index(self, glottocode):
+        if glottocode not in self._by_glottocode:
+            index = collections.defaultdict(list)
+            for bibkey in self.bibkeys_by_glottocode[glottocode]:
+                bibentry = self.bibliography_entries[bibkey][1]
+                year = bibentry.get('year', '')
+                item = (bibkey, year, bibentry.get('title', '').lower())
+                tokens = {
+                    token
+                    for lastname in self.parse_authors(bibkey)
+                    for token in REGEX_NAME_TOKEN_SEPARATOR.split(lastname)}
+                for token in tokens:
+                    index[token].append(item)
+                    for year_part in _substrings(year, YEAR_LENGTHS):
+                        index[token, year_part].append(item)
+            self._by_glottocode[glottocode] = index
+        return self._by_glottocode[glottocode]
+
+    def candidates(self, glottocode, name_token, year):
+        """Return (bibkey, year, lowercase title) triples for a glottocode
+        with `name_token` as part of an author's family name.
+
+        If possible, only triples for which `year` is part of the year field
+        are returned.
+        """
+        index = self._index(glottocode)
+        if len(year) in YEAR_LENGTHS:
+            return index.get((name_token, year), ())
+        return index.get(name_token, ())  # pragma: no cover
+
+
+class Resolution(collections.namedtuple('Resolution', 'matched unmatched')):
+    """
+    :ivar matched: `tuple` of (bibkey, cleaned bibkey, pages) triples.
+    :ivar unmatched: `tuple` of unresolved citations.
+    """
+
+
 class BibliographyMatcher:
     """Object for resolving citations in a datasheet.
 
@@ -56,16 +150,14 @@ class BibliographyMatcher:
         `get_unresolved_citations()` method.
     """
 
-    def __init__(self, bibliography_entries, bibkeys_by_glottocode):
+    def __init__(self, bibliography_entries, bibkeys_by_glottocode, index=None):
         self._unresolved_citations = collections.Counter()
         self._sources = collections.OrderedDict()
         self._source_occurrences = collections.Counter()
         self._bibliography_entries = bibliography_entries
         self._bibkeys_by_glottocode = bibkeys_by_glottocode
-
-        # Note: Caching the family names of the authors because parsing them
-        # turned out to be quite expensive.
-        self._parsed_author_cache = {}
+        self._index = index or BibliographyIndex(
+            bibliography_entries, bibkeys_by_glottocode)
 
     def has_sources(self):
         """Return True iff. there are citations which could be resolved."""
@@ -85,68 +177,39 @@ class BibliographyMatcher:
         """Return a list of tuples (citation, occurrence_count)."""
         return self._unresolved_citations.most_common()
 
-    def _parse_authors(self, bibkey):
-        """Return set of family names of authors for a bibkey (cached)."""
-        if bibkey in self._parsed_author_cache:
-            return self._parsed_author_cache[bibkey]
-        else:
-            bibentry = self._bibliography_entries[bibkey][1]
-            bibauthors = bibentry.get('author') or bibentry.get('editor') or ''
-            family_names = {
-                undiacritic(x['lastname'])
-                for x in bib.parse_authors(bibauthors)}
-            family_names.update(bib.bibkey_authors(bibkey))
-            self._parsed_author_cache[bibkey] = family_names
-            return family_names
-
     def _bibkeys_from_citation(
         self, author, year, pages, word_from_title, glottocode
     ):
         """Return bibliography keys corresponding to a citation."""
 
         citation_lastname = undiacritic(bib.parse_authors(author)[0]['lastname'])
-        for name_part in re.split(r'[\s,.\-]+', citation_lastname):
+        for name_part in REGEX_NAME_TOKEN_SEPARATOR.split(citation_lastname):
             if name_part.strip() and name_part[0].isupper() and name_part not in VON_PREFIXES:
                 citation_firsttoken = name_part
                 break
         else:
-            citation_firsttoken = None
+            return []
         word_from_title_norm = word_from_title.replace('_', ' ')
 
-        bibkeys = []
-        for bibkey in self._bibkeys_by_glottocode[glottocode]:
-            bibentry = self._bibliography_entries[bibkey][1]
-            bibtitle = bibentry.get('title', '').lower()
-            family_names = self._parse_authors(bibkey)
-
-            if year not in bibentry.get('year', ''):
-                continue
-            if word_from_title_norm and word_from_title_norm not in bibtitle:
-                continue
-            if not any(
-                citation_firsttoken in re.split(r'[\s,.\-]+', lastname)
-                for lastname in family_names
-            ):
-                continue
-
-            bibkeys.append(bibkey)
+        return [
+            bibkey
+            for bibkey, bibyear, bibtitle in self._index.candidates(
+                glottocode, citation_firsttoken, year)
+            if year in bibyear
+            and (not word_from_title_norm or word_from_title_norm in bibtitle)]
 
-        return bibkeys
+    def resolve_citations(self, glottocode, source_string):
+        """Resolve the citations in a Source string.
 
-    def add_resolved_citation_to_row(self, glottocode, sheet_row):
-        """Destructively add citations to the row of a datasheet.
+        This does not change the state of the `BibliographyMatcher`, so
+        the results can be computed once for each distinct pair
+        (`glottocode`, `source_string`) - possibly in another process.
 
-        The `BibliographyMatcher` keeps track of all matched or unmatched
-        citations it encounters.  Those can be retrieved using the
-        `get_sources` and `get_unresolved_citations` methods.
+        :return: `Resolution`
         """
-        if not sheet_row.Source:
-            return
-
         matched_refs = set()
         unmatched_refs = set()
 
-        source_string = sheet_row.Source
         authoryears = list(bib.iter_authoryearpages(source_string))
         if not authoryears and bib.mismatch_is_fatal(source_string):
             unmatched_refs.add((source_string, glottocode))
@@ -166,16 +229,26 @@ class BibliographyMatcher:
             else:
                 unmatched_refs.add((author, year, glottocode))
 
+        matched_refs = sorted(matched_refs, key=lambda r: (r[0], r[1] or ''))
+        return Resolution(
+            tuple((key, clean_bibkey(key), pages) for key, pages in matched_refs),
+            tuple(sorted(unmatched_refs)))
+
+    def add_resolution_to_row(self, sheet_row, resolution):
+        """Destructively add resolved citations to the row of a datasheet.
+
+        :param resolution: `Resolution` as returned by `resolve_citations`
+            for the row's Source.
+        """
+        source_string = sheet_row.Source
+        matched_refs, unmatched_refs = resolution
+
         # output: record unsucessful matches
 
         self._unresolved_citations.update(unmatched_refs)
 
         # output: record successful matches
 
-        matched_refs = sorted(matched_refs, key=lambda r: (r[0], r[1] or ''))
-        matched_refs = [
-            (key, clean_bibkey(key), pages) for key, pages in matched_refs]
-
         for old_bibkey, new_bibkey, _ in matched_refs:
             if new_bibkey not in self._sources:
                 type_, fields = self._bibliography_entries[old_bibkey]
@@ -202,14 +275,257 @@ class BibliographyMatcher:
         else:
             sheet_row.Source_comment = source_string
 
+    def add_resolved_citation_to_row(self, glottocode, sheet_row):
+        """Destructively add citations to the row of a datasheet.
+
+        The `BibliographyMatcher` keeps track of all matched or unmatched
+        citations it encounters.  Those can be retrieved using the
+        `get_sources` and `get_unresolved_citations` methods.
+        """
+        if not sheet_row.Source:
+            return
+        self.add_resolution_to_row(
+            sheet_row, self.resolve_citations(glottocode, sheet_row.Source))
+
+
+_matcher = None
+
+
+def _init_worker(bibliography_entries, bibkeys_by_glottocode):  # pragma: no cover
+    global _matcher
+    _matcher = BibliographyMatcher(bibliography_entries, bibkeys_by_glottocode)
+
+
+def _resolve_citations(key):  # pragma: no cover
+    return _matcher.resolve_citations(*key)
+
+
+def resolve_sources(
+    sheets, bibliography_entries, bibkeys_by_glottocode, index=None, workers=None
+):
+    """Resolve the citations in the rows of many sheets.
+
+    Each distinct pair (glottocode, Source) is resolved only once - if
+    `workers` is specified, in a pool of processes, each holding a copy of
+    the bibliography.  The rows are then updated as with
+    `BibliographyMatcher.add_resolved_citation_to_row`.
+
+    :param sheets: Iterable of pairs (glottocode, `list` of `pygrambank.sheet.Row`).
+    :return: `list` of `BibliographyMatcher` instances, one per sheet.
+    """
+    sheets = [(glottocode, list(rows)) for glottocode, rows in sheets]
+    keys = sorted({
+        (glottocode, row.Source)
+        for glottocode, rows in sheets for row in rows if row.Source})
+
+    index = index or BibliographyIndex(bibliography_entries, bibkeys_by_glottocode)
+    if workers:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(bibliography_entries, bibkeys_by_glottocode),
+        ) as executor:
+            resolutions = dict(zip(keys, executor.map(
+                _resolve_citations, keys, chunksize=max(1, len(keys) // (workers * 4)))))
+    else:
+        matcher = BibliographyMatcher(
+            bibliography_entries, bibkeys_by_glottocode, index=index)
+        resolutions = {key: matcher.resolve_citations(*key) for key in keys}
+
+    res = []
+    for glottocode, rows in sheets:
+        matcher = BibliographyMatcher(
+            bibliography_entries, bibkeys_by_glottocode, index=index)
+        for row in rows:
+            if row.Source:
+                matcher.add_resolution_to_row(row, resolutions[glottocode, row.Source])
+        res.append(matcher)
+    return res
+
+
+GLOTTOLOG_SNAPSHOT_VERSION = 1
+
+# Stand-in for the level and macroarea objects of `pyglottolog`, of which we only use the name:
+Named = collections.namedtuple('Named', ['name'])
+
+
+@attr.s(slots=True)
+class Languoid:
+    """
+    The subset of the data of a `pyglottolog.languoids.Languoid` stored in a Glottolog snapshot.
+    """
+    id = attr.ib()
+    name = attr.ib()
+    level = attr.ib()
+    lineage = attr.ib()
+    macroareas = attr.ib()
+    latitude = attr.ib()
+    longitude = attr.ib()
+    iso = attr.ib()
+    hid = attr.ib()
+
+
+def write_glottolog_snapshot(glottolog, path, glottocodes=None):
+    """
+    Write the languoid data needed by `GlottologGB` to a compact JSON file.
+
+    Each languoid is stored as list [glottocode, name, level, parent glottocode, macroareas, \
+    latitude, longitude, ISO 639-3 code, hid], with parents preceding their children.
+
+    :param glottolog: `GlottologGB` instance.
+    :param glottocodes: Optional collection of glottocodes to restrict the snapshot to - \
+    ancestors of these languoids are included as well.
+    :return: The number of languoids in the snapshot.
+    """
+    languoids = glottolog.languoids
+    if glottocodes is not None:
+        selected = set()
+        for lang in languoids:
+            if lang.id in glottocodes:
+                selected.add(lang.id)
+                selected.update(gc for _, gc, _ in lang.lineage)
+        languoids = [lang for lang in languoids if lang.id in selected]
+    rows = [
+        [
+            lang.id,
+            lang.name,
+            lang.level.name,
+            lang.lineage[-1][1] if lang.lineage else None,
+            [ma.name for ma in lang.macroareas],
+            lang.latitude,
+            lang.longitude,
+            lang.iso,
+            lang.hid,
+        ]
+        # `pyglottolog` reads the languoid tree top-down, i.e. parents precede their children:
+        for lang in languoids]
+    with open(str(path), 'w', encoding='utf8') as fp:
+        json.dump(
+            dict(
+                version=GLOTTOLOG_SNAPSHOT_VERSION,
+                glottolog=glottolog_version(glottolog.api.repos),
+                languoids=rows),
+            fp,
+            ensure_ascii=False,
+            separators=(',', ':'))
+    return len(rows)
+
+
+def read_glottolog_snapshot(path):
+    """
+    Read a file written with `write_glottolog_snapshot`.
+
+    :return: `list` of `Languoid` instances.
+    """
+    return list(iter_languoids(_read_snapshot_rows(path)))
+
+
+def _read_snapshot_rows(path):
+    with open(str(path), encoding='utf8') as fp:
+        data = json.load(fp)
+    if data.get('version') != GLOTTOLOG_SNAPSHOT_VERSION:
+        raise ValueError('{}: incompatible Glottolog snapshot'.format(path))
+    return data['languoids']
+
+
+def iter_languoids(rows):
+    """
+    Create `Languoid` instances from languoid data as stored in a Glottolog snapshot.
+
+    :param rows: Sequence of languoid data lists, with parents preceding their children.
+    """
+    names, languoids = {}, {}
+    for gc, name, level, parent, macroareas, lat, lon, iso, hid in rows:
+        level = names.setdefault(level, Named(level))
+        if parent:
+            parent = languoids[parent]
+            lineage = parent.lineage + [(parent.name, parent.id, parent.level)]
+        else:
+            lineage = []
+        languoids[gc] = lang = Languoid(
+            gc,
+            name,
+            level,
+            lineage,
+            [names.setdefault(ma, Named(ma)) for ma in macroareas],
+            lat,
+            lon,
+            iso,
+            hid)
+        yield lang
+
+
+def _read_languoid(directory):  # pragma: no cover
+    """
+    Read the data of a languoid from its directory in the Glottolog tree - as stored in a \
+    Glottolog snapshot.
+    """
+    cfg = INI.from_file(directory / 'md.ini', interpolation=None)
+    lang = pyglottolog.languoids.Languoid(cfg, directory=directory)
+    return [
+        lang.id,
+        lang.name,
+        lang.level,
+        directory.parent.name if Glottocode.pattern.match(directory.parent.name) else None,
+        cfg.getlist('core', 'macroareas'),
+        lang.latitude,
+        lang.longitude,
+        lang.iso,
+        lang.hid,
+    ]
+
+
+def read_glottolog_tree(tree, workers):
+    """
+    Read the languoid data from the Glottolog tree with a pool of worker processes.
+
+    :return: pair (number of languoids, generator of languoid data lists - as stored in a \
+    Glottolog snapshot). The data is yielded as soon as it has been read, with parents preceding \
+    their children.
+    """
+    dirs = list(walk(tree, mode='dirs'))  # Top-down, i.e. parents precede their children.
+    return len(dirs), _iter_languoids_data(dirs, workers)
+
+
+def _iter_languoids_data(dirs, workers):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Results are yielded per chunk, so we limit the chunk size to report progress steadily.
+        yield from executor.map(
+            _read_languoid, dirs, chunksize=max(1, min(250, len(dirs) // (workers * 4))))
+
+
+GlottologIndex = collections.namedtuple(
+    'GlottologIndex', 'languoids languoids_by_glottocode tree languoids_by_ids')
+
 
 class GlottologGB(object):
     """
     A custom facade to the Glottolog API.
     """
-    def __init__(self, repos):
-        self.api = repos if isinstance(repos, pyglottolog.Glottolog) \
-            else pyglottolog.Glottolog(repos)
+    progress_interval = 1000
+
+    def __init__(self, repos=None, snapshot=None, workers=None, progress=None):
+        """
+        :param repos: Path to a clone of glottolog/glottolog or `pyglottolog.Glottolog` instance.
+        :param snapshot: Path to a file written by `write_glottolog_snapshot` to read the \
+        languoids from - which is a lot quicker than reading them from the repository.
+        :param workers: Number of worker processes to read the languoids from the repository \
+        with. The languoids are then `Languoid` instances rather than \
+        `pyglottolog.languoids.Languoid`.
+        :param progress: Optional callable, called with arguments `(count, total, elapsed)` \
+        while loading languoids - every `progress_interval` languoids and when done. `total` is \
+        `None` as long as the number of languoids is unknown, `elapsed` is given in seconds.
+        """
+        assert repos or snapshot
+        self.repos = repos
+        self.snapshot = snapshot
+        self.workers = workers
+        self.progress = progress
+
+    @lazyproperty
+    def api(self):
+        return self.repos if isinstance(self.repos, pyglottolog.Glottolog) \
+            else pyglottolog.Glottolog(self.repos)
 
     def bib(self, key):
         """
@@ -223,35 +539,112 @@ class GlottologGB(object):
             for e in self.api.bibfiles['{0}.bib'.format(key)].iterentries()}
 
     @lazyproperty
+    def index(self):
+        """
+        Load the languoids, building all lookups in one pass.
+        """
+        start, total = time.time(), None
+        if self.snapshot:
+            rows = _read_snapshot_rows(self.snapshot)
+            languoids, total = iter_languoids(rows), len(rows)
+        elif self.workers:
+            total, rows = read_glottolog_tree(self.api.tree, self.workers)
+            languoids = iter_languoids(rows)
+        else:
+            languoids = self.api.languoids()
+
+        res = GlottologIndex([], {}, None, {})
+        hids, parents = {}, []
+        for lang in languoids:
+            res.languoids.append(lang)
+            res.languoids_by_glottocode[lang.id] = lang
+            parents.append((lang.id, lang.lineage[-1][1] if lang.lineage else None))
+            res.languoids_by_ids[lang.id] = lang
+            if lang.iso:
+                res.languoids_by_ids[lang.iso] = lang
+            if lang.hid:
+                hids[lang.hid] = lang
+            if self.progress and len(res.languoids) % self.progress_interval == 0:
+                self.progress(len(res.languoids), total, time.time() - start)
+        # hid takes precedence over ISO 639-3 code:
+        res.languoids_by_ids.update(hids)
+        res = res._replace(tree=TreeIndex.from_parents(parents))
+        if self.progress:
+            self.progress(len(res.languoids), len(res.languoids), time.time() - start)
+        return res
+
+    @property
     def languoids(self):
-        return list(self.api.languoids())
+        return self.index.languoids
 
-    @lazyproperty
+    @property
     def languoids_by_glottocode(self):
-        return {lang.id: lang for lang in self.languoids}
+        return self.index.languoids_by_glottocode
 
-    @lazyproperty
+    @property
+    def tree(self):
+        return self.index.tree
+
+    @property
     def descendants_map(self):
-        res = collections.defaultdict(list)
-        for lang in self.languoids:
-            res[lang.id].append(lang.id)
-            if lang.lineage:
-                for _, gc, _ in lang.lineage:
-                    res[gc].append(lang.id)
-        return res
+        return DescendantsMap(self.index.tree)
 
-    @lazyproperty
+    @property
     def languoids_by_ids(self):
         """
         We provide a simple lookup for the three types of identifiers for a Glottolog languoid,
         where hid takes precedence over ISO 639-3 code.
         """
-        res = {}
-        for lang in self.languoids:
-            res[lang.id] = lang
-            if lang.iso:
-                res[lang.iso] = lang
-        for lang in self.languoids:
-            if lang.hid:
-                res[lang.hid] = lang
-        return res
+        return self.index.languoids_by_ids
+
+
+def glottolog_version(repos):
+    """
+    Identify the state of the data in a Glottolog repository.
+
+    :return: The git commit of a clean clone of glottolog/glottolog, or - if `repos` is not a \
+    clone or has uncommitted changes - a fingerprint of the languoid tree and hh.bib.
+    """
+    repos = pathlib.Path(str(repos))
+    try:
+        toplevel, commit, status = [
+            subprocess.check_output(
+                ['git', '-C', str(repos)] + cmd, stderr=subprocess.DEVNULL).decode('utf8').strip()
+            for cmd in [['rev-parse', '--show-toplevel'], ['rev-parse', 'HEAD'],
+                        ['status', '--porcelain', '--untracked-files=no']]]
+        if pathlib.Path(toplevel).resolve() == repos.resolve() and not status:
+            return commit
+    except (subprocess.CalledProcessError, OSError):
+        pass
+    return fingerprint(
+        repos / 'languoids' / 'tree',
+        repos / 'references' / 'bibtex' / 'hh.bib',
+        recursive=True)
+
+
+def load_bibliography(glottolog, grambank):
+    """
+    Load the Glottolog hh.bib and the Grambank bib and associate entries with languages.
+
+    :param glottolog: `GlottologGB` instance.
+    :param grambank: `pygrambank.api.Grambank` instance.
+    :return: pair (`dict` mapping citation keys to (type, fields) pairs, \
+    `pygrambank.tree.InheritedBibkeys` mapping glottocodes to the `set` of citation keys of \
+    entries about the language or a parent).
+    """
+    languoids_by_ids = glottolog.languoids_by_ids
+
+    bibliography_entries = {}
+    bibliography_entries.update(glottolog.bib('hh'))
+    bibliography_entries.update(grambank.bib)
+
+    bibkeys_by_glottocode = InheritedBibkeys(glottolog.tree)
+    for key, (typ, fields) in bibliography_entries.items():
+        for lang_id in bib.lgcodestr(fields.get('lgcode') or ''):
+            if lang_id in languoids_by_ids:
+                glottocode = languoids_by_ids[lang_id].id
+                if glottocode in glottolog.tree:
+                    bibkeys_by_glottocode.add(glottocode, key)
+                else:  # pragma: no cover
+                    print('---non-language', lang_id)
+    return bibliography_entries, bibkeys_by_glottocode
@@ -1,4 +1,13 @@
+import io
+import ast
 import pathlib
+import pkgutil
+import warnings
+import contextlib
+import importlib
+import collections
+
+from clldutils.clilib import Formatter
 
 
 def add_wiki_repos(parser):
@@ -7,3 +16,64 @@ def add_wiki_repos(parser):
         help="clone of grambank/grambank.wiki",
         default=pathlib.Path('../grambank.wiki'),
         type=pathlib.Path)
+
+
+def add_workers(parser):
+    parser.add_argument(
+        '--workers',
+        help="Number of worker processes to use (default: process everything serially)",
+        default=None,
+        type=int)
+
+
+def register_commands(parser, subparsers, pkg, args):
+    """
+    Register the modules in package `pkg` as subcommands.
+
+    Only the module of the command selected in `args` - i.e. the first positional argument after
+    the global options of `parser` - is imported, and with it its dependencies. For all other
+    commands, the help is read from the module docstring without importing it. If `args` cannot be
+    parsed, all modules are imported, to report errors as if all commands were registered.
+    """
+    commands = collections.OrderedDict()
+    for finder, name, ispkg in pkgutil.iter_modules(pkg.__path__):
+        if ispkg:
+            continue
+        path = pathlib.Path(finder.path) / '{}.py'.format(name)
+        with warnings.catch_warnings():  # Parsing may trigger warnings about the source.
+            warnings.simplefilter('ignore')
+            doc = ast.get_docstring(ast.parse(path.read_text(encoding='utf8')), clean=False)
+        if not doc:
+            raise ValueError('Command "{0}" is missing a docstring.'.format(name))
+        # The help option is only added when the command is registered - otherwise "COMMAND -h"
+        # would exit when determining the selected command below.
+        commands[name] = subparsers.add_parser(
+            name,
+            help=doc.strip().splitlines()[0] if doc.strip() else '',
+            description=doc,
+            formatter_class=Formatter,
+            add_help=False)
+
+    # The subcommands do not know their options yet, so we only parse the known arguments:
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            selected = parser.parse_known_args(args)[0]._command or ''
+    except SystemExit as e:
+        # Exit code 0 means the main help was requested, which - like running without a
+        # command - only lists the commands.
+        selected = None if e.code else ''
+
+    for name, subparser in commands.items():
+        if selected is None or name == selected:
+            try:
+                mod = importlib.import_module('.'.join([pkg.__name__, name]))
+            except ImportError:
+                if selected is None:
+                    # Commands with missing optional dependencies are only listed.
+                    continue
+                raise
+            subparser.add_argument(
+                '-h', '--help', action='help', help='show this help message and exit')
+            if hasattr(mod, 'register'):
+                mod.register(subparser)
+            subparser.set_defaults(main=mod.run)
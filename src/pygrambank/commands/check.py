@@ -1,11 +1,23 @@
 """
 Check original_sheets/ for correctness.
 """
+import io
+import pathlib
+import contextlib
+import collections
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
 from csvw.dsv import UnicodeWriter
-from clldutils.clilib import PathType
+from clldutils.clilib import PathType, ParserError
 
+from pygrambank.api import Grambank
 from pygrambank.sheet import Sheet
 from pygrambank.util import iterunique
+from pygrambank.cli_util import add_workers
+
+# The `Grambank` instance used by worker processes, see `_init_worker`.
+_api = None
 
 
 def register(parser):
@@ -20,25 +32,144 @@ def register(parser):
         help="Path of TSV file, to which results will be written.",
         default=None,
     )
+    parser.add_argument(
+        '--since',
+        metavar='REV',
+        help="Only check sheets which changed since git revision REV - and the other sheets "
+             "for the same languages, which compete with these in the selection of sheets "
+             "(cannot be combined with --filename)",
+        default=None,
+    )
     parser.add_argument(
         '--verbose',
         default=False,
         action='store_true',
     )
+    add_workers(parser)
+
+
+def changed_glottocodes(api, rev):
+    """
+    Determine the languages for which sheets have been added, changed or removed since a git
+    revision.
+
+    :raises ValueError: If the changes cannot be determined, e.g. because `rev` is not a valid \
+    revision or the repository is not a git checkout.
+    """
+    dirs = [api.sheets_dir.name, api.quarantine_dir.name]
+    git = ['git', '-C', str(api.repos)]
+    try:
+        paths = subprocess.check_output(
+            git + ['diff', '--name-only', '--no-renames', rev, '--'] + dirs,
+            stderr=subprocess.PIPE).decode('utf8')
+        # New sheets, which have not been added to the index yet:
+        paths += subprocess.check_output(
+            git + ['ls-files', '--others', '--exclude-standard', '--'] + dirs,
+            stderr=subprocess.PIPE).decode('utf8')
+    except subprocess.CalledProcessError as e:
+        raise ValueError(e.stderr.decode('utf8').strip() or str(e))
+    except OSError as e:  # pragma: no cover
+        raise ValueError(str(e))
+    res = set()
+    for path in paths.splitlines():
+        match = Sheet.name_pattern.match(pathlib.PurePosixPath(path).name)
+        if match:
+            res.add(match.group('glottocode'))
+    return res
+
+
+def _init_worker(repos, wiki, cache):  # pragma: no cover
+    global _api
+    _api = Grambank(repos, wiki=wiki, cache=cache)
+
+
+def _count_values(path):  # pragma: no cover
+    """
+    Read a sheet in a worker process.
+
+    :return: tuple (path, number of values)
+    """
+    return path, len(list(Sheet(path, cache=_api.sheet_cache).itervalues(_api)))
+
+
+def _check_sheet(path):  # pragma: no cover
+    """
+    Read and check a sheet in a worker process.
+
+    :return: tuple (path, number of valid rows, report rows, printed output)
+    """
+    sheet, report, out = Sheet(path, cache=_api.sheet_cache), [], io.StringIO()
+    with contextlib.redirect_stdout(out):
+        nvalid = sheet.check(_api, report=report)
+    return path, nvalid, report, out.getvalue()
+
+
+def check_sheets(api, sheets, workers, verbose=False):
+    """
+    Select the best sheet per language and check the selected sheets in a pool of worker
+    processes.
+
+    Only sheets for languages which have been coded multiple times must be read before the
+    selection - to count their values - and sheets which are not selected are not checked.
+
+    :return: pair (`list` of selected sheets, `dict` mapping sheet paths to (nvalid, report, \
+    output) tuples).
+    """
+    sheets_per_language = collections.Counter(s.glottocode for s in sheets)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(api.repos, api.wiki, api.cache),
+    ) as executor:
+        nvalues = dict(executor.map(
+            _count_values,
+            [s.path for s in sheets if sheets_per_language[s.glottocode] > 1],
+            chunksize=8))
+        # `iterunique` only looks at the number of values per sheet:
+        sheets = [s for s, _ in iterunique(
+            [(s, range(nvalues.get(s.path, 0))) for s in sheets], verbose=verbose)]
+        return sheets, {
+            res[0]: res[1:] for res in
+            executor.map(_check_sheet, [s.path for s in sheets], chunksize=8)}
 
 
 def run(args):
-    report, counts = [], {}
+    report, counts, checked = [], {}, {}
     api = args.repos
 
+    if args.filename and args.since:
+        raise ParserError('--since cannot be combined with --filename')
+    if args.filename and args.workers:
+        raise ParserError('--workers cannot be combined with --filename')
     if args.filename:
         sheets = [Sheet(args.filename)]
     else:
-        sheets = [(s, list(s.itervalues(api))) for s in api.iter_sheets()]
-        sheets = (s[0] for s in iterunique(sheets, verbose=args.verbose))
+        sheets = list(api.iter_sheets())
+        if args.since:
+            # Since the selection of sheets is done per language, we must check all sheets for
+            # languages with changed sheets.
+            try:
+                glottocodes = changed_glottocodes(api, args.since)
+            except ValueError as e:
+                args.log.error('Cannot determine sheets changed since {}: {}'.format(
+                    args.since, e))
+                return 1
+            sheets = [s for s in sheets if s.glottocode in glottocodes]
+            args.log.info('Checking {} sheets for {} languages changed since {}'.format(
+                len(sheets), len(glottocodes), args.since))
+        if args.workers:
+            sheets, checked = check_sheets(api, sheets, args.workers, verbose=args.verbose)
+        else:
+            sheets = [(s, list(s.itervalues(api))) for s in sheets]
+            sheets = (s[0] for s in iterunique(sheets, verbose=args.verbose))
 
     for sheet in sorted(sheets, key=lambda s: s.path):
-        n = sheet.check(api, report=report)
+        if sheet.path in checked:
+            n, sheet_report, out = checked[sheet.path]
+            print(out, end='')
+            report.extend(sheet_report)
+        else:
+            n = sheet.check(api, report=report)
         if (sheet.glottocode not in counts) or (n > counts[sheet.glottocode][0]):
             counts[sheet.glottocode] = (n, sheet.path.stem)
 
@@ -3,13 +3,20 @@ Write merged sheets for conflict resolution
 """
 import pathlib
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 from clldutils.clilib import PathType
 from csvw import dsv
 
+from pygrambank.api import Grambank
 from pygrambank.conflicts import (
     make_conflict_sheet, prepare_row_for_conflict_detection,
 )
+from pygrambank.sheet import Sheet, VALUE_COLUMNS
+from pygrambank.cli_util import add_workers
+
+# The `Grambank` instance used by worker processes, see `_init_worker`.
+_api = None
 
 
 def register(parser):
@@ -22,6 +29,7 @@ def register(parser):
         metavar='GLOTTOCODES',
         nargs='*',
         help='Glottocodes suspected to have conflicts [default: check all sheets]')
+    add_workers(parser)
 
 
 CONFLICT_SHEET_COLUMNS = [
@@ -38,23 +46,24 @@ CONFLICT_SHEET_COLUMNS = [
 ]
 
 
-def run(args):
-    api = args.repos
-    if not args.outdir.exists():
-        args.outdir.mkdir()
+def _init_worker(repos, wiki, cache):  # pragma: no cover
+    global _api
+    _api = Grambank(repos, wiki=wiki, cache=cache)
 
-    sheets_by_glottocode = defaultdict(list)
-    for sheet in api.iter_sheets(quarantined=True):
-        if not args.glottocodes or sheet.glottocode in args.glottocodes:
-            sheets_by_glottocode[sheet.glottocode].append(sheet)
 
-    sheets_by_glottocode = {
-        gc: sheets
-        for gc, sheets in sheets_by_glottocode.items()
-        if len(sheets) > 1}
+def _write_conflict_sheet(job):  # pragma: no cover
+    return write_conflict_sheet(_api, *job)
 
-    for gc, sheets in sheets_by_glottocode.items():
-        conflict_path = args.outdir / f'{gc}.tsv'
+
+def write_conflict_sheet(api, glottocode, paths, outdir):
+    """
+    Merge the sheets for a language into its conflict sheet, catching any errors.
+
+    :param paths: Paths of the sheets for the language.
+    :return: pair (glottocode, error message or `None`).
+    """
+    try:
+        conflict_path = outdir / f'{glottocode}.tsv'
         try:
             old_conflicts = list(dsv.reader(
                 conflict_path, delimiter='\t', dicts=True))
@@ -62,6 +71,7 @@ def run(args):
             # Just move on if there are no previous conflicts.
             old_conflicts = []
 
+        sheets = [Sheet(p, cache=api.sheet_cache, columns=VALUE_COLUMNS) for p in paths]
         all_sheet_rows = [
             prepare_row_for_conflict_detection(row, sheet, api)
             for sheet in sheets
@@ -73,17 +83,59 @@ def run(args):
             w.writerows(
                 [row.get(col, '') for col in CONFLICT_SHEET_COLUMNS]
                 for row in new_conflicts)
+        return glottocode, None
+    except Exception as e:
+        return glottocode, '{}: {}'.format(e.__class__.__name__, e)
+
+
+def run(args):
+    api = args.repos
+    if not args.outdir.exists():
+        args.outdir.mkdir()
+
+    sheets_by_glottocode = defaultdict(list)
+    for sheet in api.iter_sheets(quarantined=True):
+        if not args.glottocodes or sheet.glottocode in args.glottocodes:
+            sheets_by_glottocode[sheet.glottocode].append(sheet)
+
+    sheets_by_glottocode = {
+        gc: sheets
+        for gc, sheets in sheets_by_glottocode.items()
+        if len(sheets) > 1}
+
+    jobs = [
+        (gc, [sheet.path for sheet in sheets], args.outdir)
+        for gc, sheets in sheets_by_glottocode.items()]
+    if args.workers:
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(api.repos, api.wiki, api.cache),
+        ) as executor:
+            results = list(executor.map(_write_conflict_sheet, jobs))
+    else:
+        results = [write_conflict_sheet(api, *job) for job in jobs]
+
+    errors = [(gc, error) for gc, error in results if error]
+    for gc, error in errors:
+        args.log.error('{}: {}'.format(gc, error))
+    if errors:
+        # Sheets are only moved if conflict sheets could be written for all languages.
+        args.log.error('{} of {} conflict sheets could not be written - no sheets moved'.format(
+            len(errors), len(results)))
+        return 1
 
     # Move conflicting sheets into the quarantine folder
+    moves = []
     for sheets in sheets_by_glottocode.values():
-        if len(sheets) < 2:
-            continue
         for sheet in sheets:
             if sheet.path.parent == api.sheets_dir:
                 new_path = api.quarantine_dir / sheet.path.name
                 if new_path.exists():
                     raise IOError(f'{new_path}: already exists')
-                sheet.path.rename(new_path)
+                moves.append((sheet.path, new_path))
             else:
                 assert sheet.path.parent == api.quarantine_dir, (
                     f'{sheet.path}: not in original_sheets or quarantine')
+    for path, new_path in moves:
+        path.rename(new_path)
@@ -0,0 +1,30 @@
+"""
+Export the values of the selected sheets to a binary file, which can be memory-mapped.
+
+Load the file with `pygrambank.matrix.ValueMatrix.load`.
+"""
+import pathlib
+
+from clldutils.clilib import PathType
+
+
+def register(parser):
+    parser.add_argument(
+        'output',
+        metavar='OUTPUT',
+        help="Path of the binary file to write",
+        type=pathlib.Path,
+    )
+    parser.add_argument(
+        '--conflicts',
+        help="Directory with conflict sheets, used to merge values of quarantined sheets",
+        default=None,
+        type=PathType(type='dir'),
+    )
+
+
+def run(args):
+    matrix = args.repos.value_matrix(conflicts_dir=args.conflicts)
+    matrix.dump(args.output)
+    args.log.info('{} languages x {} features written to {}'.format(
+        *matrix.shape, args.output))
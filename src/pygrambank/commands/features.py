@@ -3,7 +3,7 @@ List active features.
 """
 import textwrap
 
-from clldutils.clilib import Table, add_format
+from clldutils.clilib import Table, ParserError, add_format
 
 from pygrambank.cli_util import add_wiki_repos
 
@@ -11,9 +11,21 @@ from pygrambank.cli_util import add_wiki_repos
 def register(parser):
     add_wiki_repos(parser)
     add_format(parser)
+    parser.add_argument(
+        '--rebuild-cache',
+        help="Rebuild the compiled feature catalogue in <repos>/.grambank-cache (requires "
+             "--cache)",
+        default=False,
+        action='store_true')
 
 
 def run(args):
+    if args.rebuild_cache:
+        if not args.repos.cache:
+            raise ParserError('--rebuild-cache requires --cache')
+        catalogue = args.repos.feature_catalogue(rebuild=True)
+        args.log.info('Compiled catalogue of {} features'.format(len(catalogue)))
+        return
     contribs = {c.id: c.name for c in args.repos.contributors}
     with Table(args, '#', 'ID', 'Title', 'Patrons') as t:
         for i, f in enumerate(args.repos.features.values(), start=1):
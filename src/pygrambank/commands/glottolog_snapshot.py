@@ -0,0 +1,51 @@
+"""
+Write the Glottolog languoid data used by pygrambank to a compact snapshot file.
+
+Reading languoids from the snapshot - via `pygrambank.cldf.GlottologGB(snapshot=...)` - is a lot
+quicker than reading them from the tree of INI files in the Glottolog repository.
+"""
+import pathlib
+
+from cldfcatalog import Catalog
+
+from pygrambank.cldf import GlottologGB, write_glottolog_snapshot
+
+
+def register(parser):
+    parser.add_argument(
+        'glottolog',
+        metavar='GLOTTOLOG',
+        help="clone of glottolog/glottolog",
+        type=pathlib.Path,
+    )
+    parser.add_argument(
+        'output',
+        metavar='OUTPUT',
+        help="Path of the snapshot file to write",
+        type=pathlib.Path,
+    )
+    parser.add_argument(
+        '--glottolog-version',
+        default=None,
+        help="tag to checkout glottolog/glottolog to",
+    )
+    parser.add_argument(
+        '--sheets-only',
+        help="Only include the languoids of sheets (and their ancestors) in the snapshot",
+        default=False,
+        action='store_true',
+    )
+
+
+def run(args):
+    if args.glottolog_version:  # pragma: no cover
+        with Catalog(args.glottolog, args.glottolog_version) as glottolog:
+            run_(args, glottolog.dir)
+    else:
+        run_(args, args.glottolog)
+
+
+def run_(args, glottolog):
+    glottocodes = {s.glottocode for s in args.repos.iter_sheets()} if args.sheets_only else None
+    n = write_glottolog_snapshot(GlottologGB(glottolog), args.output, glottocodes=glottocodes)
+    args.log.info('{} languoids written to {}'.format(n, args.output))
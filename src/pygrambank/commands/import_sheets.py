@@ -0,0 +1,132 @@
+"""
+Convert a directory of contributed spreadsheets (xlsx, xls, csv, tsv) to sheets.
+
+Input files must be named either like sheets - i.e. `<CODERS>_<glottocode>.<ext>` - or like
+`<Coder Name>_<Language name> [<glottocode>].<ext>`, where coder names are looked up in
+CONTRIBUTORS.md.
+"""
+import re
+import shutil
+import pathlib
+import tempfile
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+from csvw import dsv
+from clldutils.clilib import PathType, Table, add_format
+
+from pygrambank.sheet import Sheet
+from pygrambank.util import write_tsv, reader
+from pygrambank.cli_util import add_workers
+
+CONTRIBUTED_NAME_PATTERN = re.compile(
+    r'(?P<coders>[^_]+)_.*\[(?P<glottocode>[a-z0-9]{4}[0-9]{4})]$')
+
+
+def register(parser):
+    parser.add_argument(
+        'directory',
+        metavar='DIR',
+        help="Directory containing the spreadsheets",
+        type=PathType(type='dir'),
+    )
+    parser.add_argument(
+        '--outdir',
+        help="Directory to write the sheets to [default: original_sheets/]",
+        default=None,
+        type=PathType(type='dir'),
+    )
+    parser.add_argument(
+        '--force',
+        help="Overwrite existing sheets",
+        default=False,
+        action='store_true',
+    )
+    add_workers(parser)
+    add_format(parser, 'simple')
+
+
+def sheet_name(path, contributors):
+    """
+    Determine the name of the sheet for a contributed spreadsheet.
+
+    :param contributors: `dict` mapping contributor names to IDs.
+    :raises ValueError: If the name cannot be determined.
+    """
+    if Sheet.name_pattern.match(path.stem + '.tsv'):
+        return path.stem + '.tsv'
+    match = CONTRIBUTED_NAME_PATTERN.match(path.stem.strip())
+    if not match:
+        raise ValueError('invalid file name')
+    coders = []
+    for name in re.split(r'\s*(?:,|&|\sand\s)\s*', match.group('coders').strip()):
+        if name not in contributors:
+            raise ValueError('unknown coder: {}'.format(name))
+        coders.append(contributors[name])
+    return '{}_{}.tsv'.format('-'.join(coders), match.group('glottocode'))
+
+
+def convert(in_, out_):
+    """
+    Convert a spreadsheet, catching any errors.
+
+    The sheet is written to a temporary directory first, and only moved to `out_` if the
+    conversion succeeded - so an existing sheet is never lost, and no partial files end up in the
+    sheets directory.
+
+    :return: pair (number of rows, error message or `None`).
+    """
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = pathlib.Path(tmpdir) / out_.name
+            write_tsv(in_, tmp, Sheet(out_).glottocode)
+            nrows = sum(1 for _ in dsv.reader(tmp, delimiter='\t', dicts=True))
+            shutil.move(str(tmp), str(out_))
+        return nrows, None
+    except Exception as e:
+        return 0, '{}: {}'.format(e.__class__.__name__, e)
+
+
+def run(args):
+    outdir = args.outdir or args.repos.sheets_dir
+    contributors = {}
+    for c in args.repos.contributors:
+        contributors[c.name] = contributors[c.id] = c.id
+
+    results, jobs_by_sheet = {}, collections.defaultdict(list)
+    for p in sorted(args.directory.iterdir()):
+        if p.is_file() and reader(p):
+            try:
+                out_ = outdir / sheet_name(p, contributors)
+            except ValueError as e:
+                results[p] = ('', 0, str(e))
+                continue
+            if out_.exists() and not args.force:
+                results[p] = (out_.name, 0, 'sheet exists')
+                continue
+            jobs_by_sheet[out_].append(p)
+
+    jobs = []
+    for out_, paths in jobs_by_sheet.items():
+        if len(paths) > 1:
+            # We can't tell which of the files is the right one:
+            for p in paths:
+                results[p] = (out_.name, 0, 'multiple files for sheet: {}'.format(
+                    ', '.join(pp.name for pp in paths)))
+        else:
+            jobs.append((paths[0], out_))
+
+    if args.workers:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            converted = list(executor.map(convert, *zip(*jobs))) if jobs else []
+    else:
+        converted = [convert(in_, out_) for in_, out_ in jobs]
+    for (in_, out_), (nrows, error) in zip(jobs, converted):
+        results[in_] = (out_.name, nrows, error)
+
+    with Table(args, 'File', 'Sheet', 'Rows', 'Error') as t:
+        for p, (name, nrows, error) in sorted(results.items()):
+            t.append([p.name, name, nrows, error or ''])
+    if any(error for _, _, error in results.values()):
+        args.log.error('{} of {} files could not be imported'.format(
+            len([1 for _, _, error in results.values() if error]), len(results)))
@@ -1,16 +1,31 @@
 """
 Lookup the references given in the `Source` column of a sheet in Glottolog
 hh.bib or the Grambank bib.
+
+Since loading the bibliography takes a while, it can be loaded once by a server process,
+started with `--serve`, which then answers look-ups requested with `--client`.
 """
+import io
+import json
+import socket
 import pathlib
-import collections
+import contextlib
+import socketserver
 
 from termcolor import colored
 from cldfcatalog import Catalog
+from clldutils.path import md5
+from clldutils.clilib import ParserError
+
+from pygrambank.sheet import Sheet, VALUE_COLUMNS
+from pygrambank.cldf import (
+    BibliographyIndex, BibliographyMatcher, GlottologGB, glottolog_version, load_bibliography,
+    resolve_sources,
+)
+from pygrambank.cache import memoized
+from pygrambank.cli_util import add_workers
 
-from pygrambank.sheet import Sheet
-from pygrambank.cldf import BibliographyMatcher, GlottologGB
-from pygrambank.bib import lgcodestr
+DEFAULT_PORT = 8765
 
 
 def register(parser):
@@ -23,16 +38,43 @@ def register(parser):
     parser.add_argument(
         'sheets',
         type=pathlib.Path,
-        nargs='+',
+        nargs='*',
     )
     parser.add_argument(
         '--glottolog-version',
         default=None,
         help="tag to checkout glottolog/glottolog to",
     )
+    parser.add_argument(
+        '--serve',
+        default=False,
+        action='store_true',
+        help="Load the bibliography once and answer look-ups requested with --client",
+    )
+    parser.add_argument(
+        '--client',
+        default=False,
+        action='store_true',
+        help="Request the look-ups from a server started with --serve",
+    )
+    parser.add_argument(
+        '--port',
+        default=DEFAULT_PORT,
+        type=int,
+        help="Port of the look-up server on localhost [default: %(default)s]",
+    )
+    add_workers(parser)
+
+
+def bibliography_cache_key(glottolog, grambank):
+    return '{}-{}'.format(glottolog_version(glottolog), md5(grambank.repos / 'gb.bib'))
 
 
 def run(args):
+    if not (args.sheets or args.serve):
+        raise ParserError('no sheets specified')
+    if args.client:
+        return run_client(args)
     if args.glottolog_version:  # pragma: no cover
         with Catalog(args.glottolog, args.glottolog_version) as glottolog:
             run_(args, glottolog.dir)
@@ -41,74 +83,197 @@ def run(args):
 
 
 def run_(args, glottolog):  # pragma: no cover
-    grambank = args.repos
-    sheets = [Sheet(sh) for sh in args.sheets]
-
-    # FIXME: code duplication with cldfbench
-    print('Reading language data from Glottolog...')
-    glottolog = GlottologGB(glottolog)
-    languoids_by_ids = glottolog.languoids_by_ids
-    descendants = glottolog.descendants_map
-
-    print('Loading bibliography...')
-    bibliography_entries = {}
-    bibliography_entries.update(glottolog.bib('hh'))
-    bibliography_entries.update(grambank.bib)
-
-    bibkeys_by_glottocode = collections.defaultdict(set)
-    for key, (typ, fields) in bibliography_entries.items():
-        for lang_id in lgcodestr(fields.get('lgcode') or ''):
-            if lang_id in languoids_by_ids:
-                glottocode = languoids_by_ids[lang_id].id
-                if glottocode in descendants:
-                    for cl in descendants[glottocode]:
-                        bibkeys_by_glottocode[cl].add(key)
-                else:
-                    print('---non-language', lang_id)
-
-    for sheet in sheets:
-        glottocode = sheet.glottocode
-
-        print(colored(
-            '\nSource look-up for sheet {}...\n'.format(sheet.path),
-            attrs=['bold']))
-
-        bib_matcher = BibliographyMatcher(
-            bibliography_entries, bibkeys_by_glottocode)
-        for sheet_row in sheet.iter_row_objects(args.repos):
-            bib_matcher.add_resolved_citation_to_row(
-                sheet.glottocode, sheet_row)
-
-        print(colored('Resolved sources:', attrs=['bold']))
-        for source, occurrence_count in bib_matcher.get_sources():
-            print('{}\t{}\t{}'.format(occurrence_count, source.id, source))
-
-        if bib_matcher.has_unresolved_citations():
-            print()
-            print(colored('Unresolved sources:', attrs=['bold']))
-            for spec, occurrences in bib_matcher.get_unresolved_citations():
-                if len(spec) == 3:
-                    author, year, _ = spec
-                    print('{}\t{} ({})'.format(occurrences, author, year))
-                elif len(spec) == 2:
-                    source_string, _ = spec
-                    print('{}\t{}'.format(occurrences, source_string))
-                else:  # pragma: nocover
-                    # theoretically unreachable
-                    print('{}\t{}'.format(occurrences, spec))
-            if bibkeys_by_glottocode.get(glottocode):
-                print()
-                print(colored('Available sources:', attrs=['bold']))
-                for bibkey in bibkeys_by_glottocode[glottocode]:
-                    type_, fields = bibliography_entries[bibkey]
-                    author = fields.get('author') or fields.get('editor') or '-'
-                    year = fields.get('year') or '-'
-                    print('{}\t{}\t{}'.format(
-                        colored(bibkey, color='blue'),
-                        type_,
-                        colored('{} {}'.format(author, year), attrs=['bold'])))
-            print()
-            print(colored('FAIL', color='red'))
+    bibliography = Bibliography.load(args.repos, glottolog, workers=args.workers)
+    if args.serve:
+        server = make_server(args.repos, bibliography, args.port)
+        args.log.info('Serving source look-ups on port {}'.format(server.server_address[1]))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+    sheets = [Sheet(sheet, columns=VALUE_COLUMNS) for sheet in args.sheets]
+    matchers = resolve_sources(
+        [(sheet.glottocode, sheet.iter_row_objects(args.repos)) for sheet in sheets],
+        bibliography.entries,
+        bibliography.bibkeys_by_glottocode,
+        index=bibliography.index,
+        workers=args.workers)
+    for sheet, bib_matcher in zip(sheets, matchers):
+        report(bibliography, sheet, bib_matcher)
+
+
+class Bibliography(object):
+    """
+    The bibliography data needed for source look-ups, i.e. everything which can be shared
+    between look-ups for multiple sheets.
+    """
+    def __init__(self, glottolog, entries, bibkeys_by_glottocode):
+        self.glottolog = glottolog
+        self.entries = entries
+        self.bibkeys_by_glottocode = bibkeys_by_glottocode
+        self.index = BibliographyIndex(entries, bibkeys_by_glottocode)
+
+    @classmethod
+    def load(cls, grambank, glottolog, workers=None):
+        # FIXME: code duplication with cldfbench
+        def progress(count, total, elapsed):
+            if count == total:
+                print('{} languoids read in {:.1f}s'.format(count, elapsed))
+
+        def load():
+            print('Reading language data from Glottolog...')
+            return load_bibliography(
+                GlottologGB(glottolog, workers=workers, progress=progress), grambank)
+
+        print('Loading bibliography...')
+        if grambank.cache:
+            res = memoized(
+                grambank.cache_dir / 'bibliography',
+                bibliography_cache_key(glottolog, grambank),
+                load)
         else:
+            res = load()
+        return cls(glottolog, *res)
+
+
+def lookup(grambank, bibliography, sheet):
+    """
+    Print the source look-up report for a sheet.
+    """
+    bib_matcher = BibliographyMatcher(
+        bibliography.entries, bibliography.bibkeys_by_glottocode, index=bibliography.index)
+    for sheet_row in sheet.iter_row_objects(grambank):
+        bib_matcher.add_resolved_citation_to_row(
+            sheet.glottocode, sheet_row)
+    report(bibliography, sheet, bib_matcher)
+
+
+def report(bibliography, sheet, bib_matcher):
+    glottocode = sheet.glottocode
+    bibliography_entries = bibliography.entries
+    bibkeys_by_glottocode = bibliography.bibkeys_by_glottocode
+
+    print(colored(
+        '\nSource look-up for sheet {}...\n'.format(sheet.path),
+        attrs=['bold']))
+
+    print(colored('Resolved sources:', attrs=['bold']))
+    for source, occurrence_count in bib_matcher.get_sources():
+        print('{}\t{}\t{}'.format(occurrence_count, source.id, source))
+
+    if bib_matcher.has_unresolved_citations():
+        print()
+        print(colored('Unresolved sources:', attrs=['bold']))
+        for spec, occurrences in bib_matcher.get_unresolved_citations():
+            if len(spec) == 3:
+                author, year, _ = spec
+                print('{}\t{} ({})'.format(occurrences, author, year))
+            elif len(spec) == 2:
+                source_string, _ = spec
+                print('{}\t{}'.format(occurrences, source_string))
+            else:  # pragma: nocover
+                # theoretically unreachable
+                print('{}\t{}'.format(occurrences, spec))
+        if bibkeys_by_glottocode.get(glottocode):
             print()
-            print(colored('OK', color='green'))
+            print(colored('Available sources:', attrs=['bold']))
+            for bibkey in bibkeys_by_glottocode[glottocode]:
+                type_, fields = bibliography_entries[bibkey]
+                author = fields.get('author') or fields.get('editor') or '-'
+                year = fields.get('year') or '-'
+                print('{}\t{}\t{}'.format(
+                    colored(bibkey, color='blue'),
+                    type_,
+                    colored('{} {}'.format(author, year), attrs=['bold'])))
+        print()
+        print(colored('FAIL', color='red'))
+    else:
+        print()
+        print(colored('OK', color='green'))
+
+
+class LookupHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one request of the look-up protocol: The client sends a JSON object with keys
+    "glottolog" and "sheets" (a list of absolute paths) on one line, the server responds with the
+    look-up reports and closes the connection.
+    """
+    def handle(self):
+        try:
+            req = json.loads(self.rfile.readline().decode('utf8'))
+            if pathlib.Path(req['glottolog']).resolve() != \
+                    pathlib.Path(str(self.server.bibliography.glottolog)).resolve():
+                raise ValueError('server uses Glottolog at {}'.format(
+                    self.server.bibliography.glottolog))
+            sheets = req['sheets']
+        except Exception as e:
+            self.error(e)
+            return
+        for path in sheets:
+            out = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(out):
+                    lookup(
+                        self.server.grambank,
+                        self.server.bibliography,
+                        Sheet(pathlib.Path(path), columns=VALUE_COLUMNS))
+            except Exception as e:
+                self.error(e)
+                continue
+            self.wfile.write(out.getvalue().encode('utf8'))
+
+    def error(self, e):
+        self.wfile.write('ERROR: {}: {}\n'.format(e.__class__.__name__, e).encode('utf8'))
+
+
+class LookupServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+def make_server(grambank, bibliography, port=DEFAULT_PORT):
+    """
+    Create a server answering source look-ups on localhost.
+
+    Look-ups are answered one at a time, thus the bibliography index can be shared safely.
+    """
+    server = LookupServer(('127.0.0.1', port), LookupHandler)
+    server.grambank = grambank
+    server.bibliography = bibliography
+    return server
+
+
+def request_lookup(port, glottolog, sheets):
+    """
+    Request source look-ups from a server started with `sourcelookup --serve`.
+
+    :return: The report as `str`.
+    """
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        req = dict(
+            glottolog=str(pathlib.Path(str(glottolog)).resolve()),
+            sheets=[str(pathlib.Path(str(p)).resolve()) for p in sheets])
+        sock.sendall(json.dumps(req).encode('utf8') + b'\n')
+        sock.shutdown(socket.SHUT_WR)
+        res = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            res.append(chunk)
+    return b''.join(res).decode('utf8')
+
+
+def run_client(args):
+    try:
+        report = request_lookup(args.port, args.glottolog, args.sheets)
+    except OSError as e:
+        args.log.error('Could not connect to server on port {}: {}'.format(args.port, e))
+        return 1
+    print(report, end='')
+    errors = [line for line in report.splitlines() if line.startswith('ERROR:')]
+    if errors:
+        args.log.error('{} look-ups failed'.format(len(errors)))
+        return 1
@@ -1,6 +1,7 @@
 """
 Summary stats on the sheets in original_sheets/
 """
+import codecs
 import collections
 
 
@@ -15,9 +16,10 @@ def run(args):
 
     print('\nSheets with BOM:')
     for sheet in sorted(sheets, key=lambda s: s.path):
-        if sheet.path.read_text(encoding='utf-8').startswith('\ufeff'):
-            print(sheet.path)
-        for i, val in enumerate(sheet._reader(dicts=True)):
+        with sheet.path.open('rb') as fp:
+            if fp.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+                print(sheet.path)
+        for i, val in enumerate(sheet.iterrows()):
             if i == 0:
                 cols.update(list(val.keys()))
             values.update([sheet.path.stem])
@@ -37,6 +37,8 @@ def run(args):
     sections = collections.Counter()
     refs = []
     for feature in args.repos.features.values():
+        for key, gb20_value, wiki_value in feature.wiki_mismatches():
+            print('++++', key, gb20_value, wiki_value)
         sections.update(list(feature.wiki))
         for line in feature.wiki.get('References', '').split('\n'):
             line = line.strip()
@@ -32,87 +32,78 @@ class Warnings:  # pragma: no cover
         self.messages += '\n{}:{}: {}'.format(level, row_['Feature_ID'], msg)
 
 
+def merge_contributors(*contributors):
+    return ' '.join(sorted(set(chain(*contributors))))
+
+
 def make_conflict_sheet(old_conflicts, potential_conflicts):
-    conflicts = defaultdict(lambda: defaultdict(list))
-    for row in old_conflicts:
-        conflicts[row['Feature_ID']][row['Sheet']].append(row)
+    """
+    Merge the rows of an existing conflict sheet with the potential conflicts found in the sheets.
 
+    Rows are indexed by (Feature_ID, Sheet) - rows without sheet are kept in a list per feature -
+    and the values per feature are tracked while merging, thus all rows are processed only once.
+    """
     # checking assumptions:
     # There is only one conflict row per sheet per feature, unless the sheet
     # name is empty.
-    for feature_id, by_sheet in conflicts.items():
-        for sheet_name, rows in by_sheet.items():
-            assert not sheet_name or len(rows) == 1, f'{sheet_name}:{feature_id}'
+    rows, sheetless = {}, defaultdict(list)
+    # The values per feature only ever grow, since replaced rows are kept as sheet-less rows.
+    values = defaultdict(set)
+    # Features with a new contender for the selected row:
+    reselect = set()
 
-    new_conflicts = (
-        make_conflict_row(row, sheet_name, warnings)
-        for row, sheet_name, warnings in potential_conflicts)
+    for row in old_conflicts:
+        feature_id, sheet_name = row['Feature_ID'], row['Sheet']
+        if sheet_name:
+            assert (feature_id, sheet_name) not in rows, f'{sheet_name}:{feature_id}'
+            rows[feature_id, sheet_name] = row
+        else:
+            sheetless[feature_id].append(row)
+        values[feature_id].add(row['Value'])
 
     field_updates = ['Comment', 'Source', 'Warnings']
 
-    # FIXME: all of this horrible btw
-    for new_row in new_conflicts:
-        if (by_sheet := conflicts.get(new_row['Feature_ID'])):
-            if (sheet_rows := by_sheet.get(new_row['Sheet'])):
-                sheet_row = sheet_rows[0]
-                if sheet_row['Value'] == new_row['Value']:
-                    # if the value hasn't changed, update other info in the row
-                    for k in field_updates:
-                        sheet_row[k] = new_row[k]
-                    contributors = sorted(set(chain(
-                        sheet_row['Contributed_Datapoint'].split(),
-                        new_row['Contributed_Datapoint'].split())))
-                    sheet_row['Contributed_Datapoint'] = ' '.join(
-                        sorted(set(contributors)))
-                else:
-                    # if the value has changed, move the old value to the custom
-                    # sheet-less answers and put the new value in its place
-                    contributors = sheet_row['Sheet']\
-                        .split('_')[0]\
-                        .split('-')
-                    contributors.extend(
-                        sheet_row['Contributed_Datapoint'].split())
-                    sheet_row['Contributed_Datapoint'] = ' '.join(
-                        sorted(set(contributors)))
-                    sheet_row['Sheet'] = ''
-                    by_sheet[''].append(sheet_row)
-                    by_sheet[new_row['Sheet']] = [new_row]
-                    # we have a new contender for selected new_row
-                    for sheet_rows in by_sheet.values():
-                        for sheet_row in sheet_rows:
-                            sheet_row['Select'] = ''
-            else:
+    for sheet_row, sheet_name, warnings in potential_conflicts:
+        new_row = make_conflict_row(sheet_row, sheet_name, warnings)
+        feature_id = new_row['Feature_ID']
+        old_row = rows.get((feature_id, sheet_name))
+        if old_row is None:
+            if feature_id in values:
                 # we have a new contender for selected row
-                for sheet_rows in by_sheet.values():
-                    for sheet_row in sheet_rows:
-                        sheet_row['Select'] = ''
-                by_sheet[new_row['Sheet']].append(new_row)
-        else:
-            # ooh, an entirely new data point
-            conflicts[new_row['Feature_ID']][new_row['Sheet']].append(new_row)
-
-    # detect if values are conflicting
-    for by_sheet in conflicts.values():
-        value_count = len({
-            row['Value']
-            for rows in by_sheet.values()
-            for row in rows})
-        if value_count == 1:
-            for sheet_rows in by_sheet.values():
-                for sheet_row in sheet_rows:
-                    sheet_row['Conflict'] = False
+                reselect.add(feature_id)
+            # else: ooh, an entirely new data point
+        elif old_row['Value'] == new_row['Value']:
+            # if the value hasn't changed, update other info in the row
+            for k in field_updates:
+                old_row[k] = new_row[k]
+            old_row['Contributed_Datapoint'] = merge_contributors(
+                old_row['Contributed_Datapoint'].split(),
+                new_row['Contributed_Datapoint'].split())
+            continue
         else:
-            for sheet_rows in by_sheet.values():
-                for sheet_row in sheet_rows:
-                    # preserve other values like `True (inactive feature)`
-                    if not sheet_row['Conflict'] or sheet_row['Conflict'] == 'False':
-                        sheet_row['Conflict'] = True
-
-    new_conflict_sheet = [
-        row
-        for by_sheet in conflicts.values()
-        for rows in by_sheet.values()
-        for row in rows]
+            # if the value has changed, move the old value to the custom
+            # sheet-less answers and put the new value in its place
+            old_row['Contributed_Datapoint'] = merge_contributors(
+                old_row['Sheet'].split('_')[0].split('-'),
+                old_row['Contributed_Datapoint'].split())
+            old_row['Sheet'] = ''
+            sheetless[feature_id].append(old_row)
+            # we have a new contender for selected row
+            reselect.add(feature_id)
+        rows[feature_id, sheet_name] = new_row
+        values[feature_id].add(new_row['Value'])
+
+    new_conflict_sheet = list(chain.from_iterable(sheetless.values()))
+    new_conflict_sheet.extend(rows.values())
+    for row in new_conflict_sheet:
+        if row['Feature_ID'] in reselect:
+            row['Select'] = ''
+        # detect if values are conflicting
+        if len(values[row['Feature_ID']]) == 1:
+            row['Conflict'] = False
+        # preserve other values like `True (inactive feature)`
+        elif not row['Conflict'] or row['Conflict'] == 'False':
+            row['Conflict'] = True
     new_conflict_sheet.sort(key=lambda r: (r['Feature_ID'], r['Sheet']))
 
     return new_conflict_sheet
@@ -0,0 +1,155 @@
+"""
+Declarative rules for the dependencies between values of related features.
+
+Each rule is a condition - a set of (feature ID, value) pairs which must all hold - together with
+the consequence of the condition being met: Either an error (e.g. for impossible combinations of
+values) or the requirement that some features must have a comment explaining the coding.
+
+Rules are evaluated for many languages at once, by intersecting the sets of languages matching
+the individual (feature ID, value) pairs of a condition.
+"""
+import itertools
+import collections
+
+__all__ = ['Rule', 'RULES', 'check_dependencies', 'check_feature_dependencies']
+
+
+class Rule(collections.namedtuple('Rule', 'condition message require_comment')):
+    """
+    :ivar condition: `tuple` of (feature ID, value) pairs.
+    :ivar message: Error message if `require_comment` is empty, otherwise the reason for \
+    requiring comments.
+    :ivar require_comment: `tuple` of feature IDs which must have a comment if the condition \
+    holds.
+    """
+    def __new__(cls, condition, message, require_comment=()):
+        return super().__new__(cls, tuple(condition), message, tuple(require_comment))
+
+    def errors(self, commented):
+        """
+        :param commented: Callable returning whether a feature has a comment.
+        """
+        if not self.require_comment:
+            yield self.message
+        for fid in self.require_comment:
+            if not commented(fid):
+                yield '{} must have a comment if {}'.format(fid, self.message)
+
+
+def all_equal(fids, value):
+    return [(fid, value) for fid in fids]
+
+
+def _multistate_rules():
+    multistate_features = [
+        # three states
+        ('GB024', 'GB024a', 'GB024b', 3),
+        ('GB025', 'GB025a', 'GB025b', 3),
+        ('GB065', 'GB065a', 'GB065b', 3),
+        ('GB130', 'GB130a', 'GB130b', 3),
+        # four states
+        ('GB193', 'GB193a', 'GB193b', 4),
+        ('GB203', 'GB203a', 'GB203b', 4)]
+    bad_vals_ternary = [
+        ('1', '0', '0'),
+        ('1', '1', '1'),
+        ('2', '1', '1'),
+        ('2', '0', '0'),
+        ('3', '0', '1'),
+        ('3', '1', '0')]
+    bad_vals_quarternary = [
+        ('0', '1', '0'),
+        ('0', '0', '1')]
+    for parent, binary_a, binary_b, n_states in multistate_features:
+        if n_states < 4:
+            vals = bad_vals_ternary
+        else:
+            vals = itertools.chain(bad_vals_ternary, bad_vals_quarternary)
+        for bad_parent, bad_a, bad_b in vals:
+            yield Rule(
+                [(parent, bad_parent), (binary_a, bad_a), (binary_b, bad_b)],
+                "{} can't be {} if {} is {} and {} is {}".format(
+                    parent, bad_parent, binary_a, bad_a, binary_b, bad_b))
+        if n_states < 4:
+            yield Rule(
+                all_equal([binary_a, binary_b], '0'),
+                "{} and {} can't both be 0".format(binary_a, binary_b))
+
+
+RULES = (
+    Rule(
+        all_equal(['GB408', 'GB409', 'GB410'], '0'),
+        "GB408, GB409, and GB410 can't all be 0"),
+    Rule(
+        all_equal(['GB131', 'GB132', 'GB133'], '0'),
+        "GB131, GB132, and GB133 can't all be 0"),
+    Rule(
+        all_equal(['GB083', 'GB084', 'GB121', 'GB521'], '0') + [('GB309', '1')],
+        'it is 1 and GB083, GB084, GB121 and GB521 are all 0',
+        ['GB309']),
+    Rule(
+        all_equal(['GB333', 'GB334', 'GB335', 'GB336'], '0'),
+        'GB333, GB334, GB335, and GB336 are all 0',
+        ['GB333', 'GB334', 'GB335', 'GB336']),
+) + tuple(
+    Rule([(fid, '1')], 'it is coded 1', [fid]) for fid in [
+        'GB026', 'GB303', 'GB320', 'GB166', 'GB197', 'GB129', 'GB285', 'GB336',
+        'GB260', 'GB165', 'GB319']
+) + (
+    Rule(
+        all_equal(['GB265', 'GB266', 'GB273'], '0'),
+        'GB265, GB266, and GB273 are all 0',
+        ['GB265', 'GB266', 'GB273']),
+    Rule(
+        all_equal(['GB072', 'GB073', 'GB074', 'GB075'], '0'),
+        'GB072, GB073, GB074, and GB075 are all 0',
+        ['GB074', 'GB075']),
+    Rule(
+        [('GB155', '1'), ('GB113', '0')],
+        'GB155 is 1 and GB113 is 0',
+        ['GB155', 'GB113']),
+    Rule(
+        all_equal(['GB022', 'GB023'], '1'),
+        'GB022 and GB023 are both 1',
+        ['GB022', 'GB023']),
+) + tuple(_multistate_rules())
+
+
+def check_dependencies(index, commented, rules=RULES):
+    """
+    Check the rules for a set of languages.
+
+    :param index: Mapping of (feature ID, value) pairs to the `set` of languages with this value.
+    :param commented: Mapping of feature IDs to the `set` of languages with a comment for the \
+    feature.
+    :return: `dict` mapping languages with errors to the `list` of error messages.
+    """
+    res = collections.defaultdict(list)
+    empty = frozenset()
+    for rule in rules:
+        languages = None
+        for cond in rule.condition:
+            languages = index.get(cond, empty) if languages is None \
+                else languages & index.get(cond, empty)
+            if not languages:
+                break
+        for lang in sorted(languages or []):
+            errors = list(rule.errors(lambda fid: lang in commented.get(fid, empty)))
+            if errors:
+                res[lang].extend(errors)
+    return dict(res)
+
+
+def check_feature_dependencies(rows, rules=RULES):
+    """
+    Check the rules for the rows of one sheet.
+
+    :param rows: Iterable of `pygrambank.sheet.Row` instances.
+    :return: `list` of error messages.
+    """
+    # The last value of a feature coded multiple times takes precedence - as in
+    # `pygrambank.matrix.ValueMatrix`:
+    values = {r.Feature_ID: r for r in rows if r.Feature_ID and r.Value}
+    index = {(fid, r.Value): {None} for fid, r in values.items()}
+    commented = {fid: {None} for fid, r in values.items() if r.Comment}
+    return check_dependencies(index, commented, rules=rules).get(None, [])
@@ -1,6 +1,7 @@
 import re
 import unicodedata
 from collections import OrderedDict, Counter
+from collections.abc import Mapping
 
 from clldutils.misc import lazyproperty
 
@@ -24,9 +25,17 @@ patrons = {
 
 
 class Feature(OrderedDict):
-    def __init__(self, spec, wiki):
+    def __init__(self, spec, wiki, registry=None, wiki_sections=None):
+        """
+        :param registry: `Features` instance, used to look up a multistate parent, from which \
+        binarised features inherit wiki content.
+        :param wiki_sections: Sections of the wiki page as read before, e.g. from a `Features` \
+        catalogue.
+        """
         OrderedDict.__init__(self, spec)
         self._wiki = wiki
+        self._registry = registry
+        self._wiki_sections = wiki_sections
         self.domain = OrderedDict()
         spec = self['Possible Values'].replace('multistate', '').strip()
         delimiter = ',' if ',' in spec else ';'
@@ -38,29 +47,34 @@ class Feature(OrderedDict):
     def wiki_or_gb20(self, wiki_key, gb20_key):
         return self.wiki.get(wiki_key) or self.get(gb20_key) or ''
 
+    @staticmethod
+    def iter_chunk_items(chunk):
+        for line in chunk.split('\n'):
+            if ':' in line and not line.startswith('#'):
+                yield re.fullmatch(r'([^:]*?)\s*:\s*(.*)', line).groups()
+
     @classmethod
-    def from_chunk(cls, chunk, wiki):
-        items = [
-            re.fullmatch(r'([^:]*?)\s*:\s*(.*)', line).groups()
-            for line in chunk.split('\n')
-            if ':' in line and not line.startswith('#')]
+    def from_chunk(cls, chunk, wiki, registry=None):
+        items = list(cls.iter_chunk_items(chunk))
         # Make sure there are no duplicate keys:
         keys = Counter(i[0] for i in items)
         if len(keys) != len(items):
             raise ValueError('Duplicate keys: {}'.format(
                 ';'.join(key for key, count in keys.items() if count > 1)))
-        res = cls(items, wiki)
-        for k, v in res.wiki.items():
-            if k in res:
-                if res[k] != v:  # pragma: no cover
-                    print('++++', k, res[k], v)
-        return res
+        return cls(items, wiki, registry=registry)
+
+    def wiki_mismatches(self):
+        """
+        :return: `list` of (key, gb20 value, wiki value) triples for keys with differing values.
+        """
+        return [(k, self[k], v) for k, v in self.wiki.items() if k in self and self[k] != v]
 
     def as_chunk(self):
         return ''.join('{0}: {1}\n'.format(k, v) for k, v in self.items())
 
-    @lazyproperty
-    def wiki(self):
+    def _read_wiki(self):
+        if self._wiki_sections is not None:
+            return OrderedDict(self._wiki_sections)
         res = OrderedDict()
         p = self._wiki / '{}.md'.format(self.id)
         if not p.exists():
@@ -82,6 +96,18 @@ class Feature(OrderedDict):
         res['Patron'] = res['Patron'].split('\n')[0]
         return res
 
+    @lazyproperty
+    def wiki(self):
+        res = self._read_wiki()
+        # binarised features inherit info from non-binarised parents.
+        parent_id = self.get('Multistate_parent')
+        if self._registry is not None and parent_id and parent_id in self._registry:
+            parent_wiki = self._registry[parent_id].wiki
+            for key in ['Patron', 'Summary']:
+                if not res.get(key) and parent_wiki.get(key):
+                    res[key] = parent_wiki[key]
+        return res
+
     @lazyproperty
     def description(self):
         if self._wiki.joinpath('{0}.md'.format(self.id)).exists():
@@ -112,31 +138,68 @@ class GB20(object):
     def __init__(self, path):
         self.path = path
 
-    def _iterfeatures(self, wiki):
+    def iterchunks(self):
         # I don't want to deal with combining diacritics tbh…
         wikitext = unicodedata.normalize(
             'NFC',
             self.path.read_text(encoding='utf-8'))
         for chunk in wikitext.split(self.CHUNK_SEP):
             if chunk.strip():
-                yield Feature.from_chunk(chunk, wiki)
+                yield chunk
 
-    def read_features(self, wiki):
-        features = {
-            f['Grambank ID']: f
-            for f in self._iterfeatures(wiki)}
-        # binarised features inherit info from non-binarised parents.
-        for feature in features.values():
-            parent_id = feature.get('Multistate_parent')
-            if not parent_id or parent_id not in features:
-                continue
-            parent_wiki = features[parent_id].wiki
-            for key in ['Patron', 'Summary']:
-                if not feature.wiki.get(key) and parent_wiki.get(key):
-                    feature.wiki[key] = parent_wiki[key]
-        return features
+    def read_features(self, wiki, catalogue=None):
+        return Features(self, wiki, catalogue=catalogue)
 
     def save(self, features):
         with self.path.open('w', encoding='utf8') as fp:
             fp.write('# -*- coding: utf-8 -*-\n')
             fp.write(self.CHUNK_SEP.join(f.as_chunk() for f in features))
+
+
+class Features(Mapping):
+    """
+    The features specified in gb20.txt, as mapping of feature IDs to `Feature` instances.
+
+    Features are parsed from their gb20.txt chunk when first accessed; wiki pages are only read
+    when `Feature.wiki` or `Feature.description` is accessed.
+
+    Alternatively, features can be loaded from a catalogue - as returned by `Features.catalogue`
+    - which holds the parsed gb20.txt specs and wiki sections of all features.
+    """
+    def __init__(self, gb20, wiki, catalogue=None):
+        self.wiki = wiki
+        self._catalogue = catalogue
+        self._chunks = OrderedDict()
+        if catalogue is None:
+            for chunk in gb20.iterchunks():
+                for k, v in Feature.iter_chunk_items(chunk):
+                    if k == 'Grambank ID':
+                        self._chunks[v] = chunk
+                        break
+                else:
+                    raise ValueError('Feature without Grambank ID:\n{}'.format(chunk))
+        self._features = {}
+
+    def __getitem__(self, fid):
+        if fid not in self._features:
+            if self._catalogue is not None:
+                spec, wiki_sections = self._catalogue[fid]
+                self._features[fid] = Feature(
+                    spec, self.wiki, registry=self, wiki_sections=wiki_sections)
+            else:
+                self._features[fid] = Feature.from_chunk(
+                    self._chunks[fid], self.wiki, registry=self)
+        return self._features[fid]
+
+    def __iter__(self):
+        return iter(self._catalogue if self._catalogue is not None else self._chunks)
+
+    def __len__(self):
+        return len(self._catalogue if self._catalogue is not None else self._chunks)
+
+    def catalogue(self):
+        """
+        :return: `OrderedDict` mapping feature IDs to pairs (spec items, wiki sections).
+        """
+        return OrderedDict(
+            (fid, (list(f.items()), f._read_wiki())) for fid, f in self.items())
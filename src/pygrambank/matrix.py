@@ -0,0 +1,278 @@
+"""
+A compact, columnar in-memory representation of the Grambank values.
+
+Values are stored as small integer codes in one flat `array.array`, indexed by
+(language, feature), with `?` and missing values encoded as negative sentinels. Sources and
+comments are stored as indices into a table of interned strings.
+
+A `ValueMatrix` can be written to a single binary file, laid out as follows:
+
+- the magic bytes `GBVM`, followed by the length of a JSON header as unsigned 32-bit integer,
+- the JSON header, listing glottocodes, features and the offsets, lengths and item types of
+- the data sections - each starting at a multiple of 8 bytes: `values`, `sources`, `comments`,
+  `string_offsets` (i.e. the start offsets of the strings plus the end of the last string) and
+  `strings` (the concatenated UTF-8 encoded strings).
+
+Such a file can be memory-mapped, i.e. loaded without copying the data sections (and shared
+between processes via the page cache).
+"""
+import sys
+import json
+import mmap
+import array
+import struct
+import collections
+
+from pygrambank.dependencies import RULES, check_dependencies
+
+__all__ = ['MISSING', 'UNKNOWN', 'StringTable', 'MappedStringTable', 'ValueMatrix']
+
+MISSING = -1
+UNKNOWN = -2  # i.e. a value of "?"
+
+MAGIC = b'GBVM'
+FORMAT_VERSION = 1
+
+
+def encode_value(value):
+    if not value:
+        return MISSING
+    if value == '?':
+        return UNKNOWN
+    return int(value)
+
+
+def decode_value(code):
+    if code == MISSING:
+        return None
+    if code == UNKNOWN:
+        return '?'
+    return str(code)
+
+
+class StringTable(object):
+    """
+    A table of interned strings, where index 0 is reserved for the empty string.
+    """
+    def __init__(self, strings=None):
+        self.strings = strings or ['']
+        self._index = None
+
+    def add(self, s):
+        if self._index is None:
+            self._index = {v: i for i, v in enumerate(self.strings)}
+        s = s or ''
+        if s not in self._index:
+            self._index[s] = len(self.strings)
+            self.strings.append(s)
+        return self._index[s]
+
+    def __getitem__(self, i):
+        return self.strings[i]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class MappedStringTable(object):
+    """
+    A read-only string table, backed by a buffer of concatenated UTF-8 encoded strings.
+    """
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __getitem__(self, i):
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], 'utf8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def _padding(n):
+    return (8 - n % 8) % 8
+
+
+class ValueMatrix(object):
+    """
+    Values for a set of languages and features.
+
+    :ivar glottocodes: `list` of glottocodes, i.e. the row labels.
+    :ivar features: `list` of feature IDs, i.e. the column labels.
+    :ivar values: Sequence of integer value codes, in row-major order.
+    :ivar sources: Sequence of indices into `strings`, in row-major order.
+    :ivar comments: Sequence of indices into `strings`, in row-major order.
+    :ivar strings: `StringTable` holding sources and comments.
+    """
+    def __init__(self, glottocodes, features, values, sources, comments, strings):
+        self.glottocodes = glottocodes
+        self.features = features
+        self.values = values
+        self.sources = sources
+        self.comments = comments
+        self.strings = strings
+        self._language_index = {gc: i for i, gc in enumerate(glottocodes)}
+        self._feature_index = {fid: i for i, fid in enumerate(features)}
+
+    @classmethod
+    def from_sheets(cls, sheets, features):
+        """
+        :param sheets: Iterable of pairs (`Sheet`, `list` of valid row `dict`s), as yielded by \
+        `pygrambank.util.iterunique` - i.e. with one sheet per glottocode.
+        :param features: Mapping of feature IDs to `Feature` instances.
+        """
+        sheets = sorted(sheets, key=lambda s: s[0].glottocode)
+        glottocodes, features = [s[0].glottocode for s in sheets], list(features)
+        assert len(set(glottocodes)) == len(glottocodes), 'Multiple sheets per language'
+        fids = {fid: i for i, fid in enumerate(features)}
+        size = len(glottocodes) * len(features)
+        values = array.array('b', [MISSING]) * size
+        sources, comments = array.array('i', [0]) * size, array.array('i', [0]) * size
+        strings = StringTable()
+        for i, (_, rows) in enumerate(sheets):
+            offset = i * len(features)
+            for row in rows:
+                if row['Feature_ID'] not in fids:  # pragma: no cover
+                    continue
+                # If the feature is coded multiple times, the last value takes precedence - as in
+                # `pygrambank.dependencies.check_feature_dependencies`, used by `Sheet.check`.
+                j = offset + fids[row['Feature_ID']]
+                values[j] = encode_value(row['Value'])
+                sources[j] = strings.add(row.get('Source'))
+                comments[j] = strings.add(row.get('Comment'))
+        return cls(glottocodes, features, values, sources, comments, strings)
+
+    @property
+    def shape(self):
+        return len(self.glottocodes), len(self.features)
+
+    def _offset(self, glottocode, feature):
+        return self._language_index[glottocode] * len(self.features) \
+            + self._feature_index[feature]
+
+    def code(self, glottocode, feature):
+        return self.values[self._offset(glottocode, feature)]
+
+    def __getitem__(self, key):
+        """
+        :param key: (glottocode, feature ID) pair.
+        :return: The value as string, or `None` if the datapoint is missing.
+        """
+        return decode_value(self.code(*key))
+
+    def source(self, glottocode, feature):
+        return self.strings[self.sources[self._offset(glottocode, feature)]]
+
+    def comment(self, glottocode, feature):
+        return self.strings[self.comments[self._offset(glottocode, feature)]]
+
+    def column(self, feature, data=None):
+        """
+        :return: The sequence of codes (or string indices, if `data` is passed) for a feature.
+        """
+        data = self.values if data is None else data
+        return data[self._feature_index[feature]::len(self.features)]
+
+    def value_counts(self, feature):
+        """
+        :return: `collections.Counter` of the value codes for a feature.
+        """
+        return collections.Counter(self.column(feature))
+
+    def coverage(self):
+        """
+        :return: `dict` mapping feature IDs to the number of languages with a known value.
+        """
+        return {
+            fid: sum(1 for c in self.column(fid) if c >= 0) for fid in self.features}
+
+    def check_dependencies(self, rules=RULES):
+        """
+        Check the feature dependencies for all languages.
+
+        :return: `dict` mapping glottocodes to `list`s of error messages.
+        """
+        index, commented = {}, {}
+        for rule in rules:
+            for fid, value in rule.condition:
+                if (fid, value) not in index and fid in self._feature_index:
+                    code = encode_value(value)
+                    index[fid, value] = {
+                        self.glottocodes[i] for i, c in enumerate(self.column(fid)) if c == code}
+            for fid in rule.require_comment:
+                if fid not in commented and fid in self._feature_index:
+                    commented[fid] = {
+                        self.glottocodes[i]
+                        for i, c in enumerate(self.column(fid, self.comments)) if c}
+        return check_dependencies(index, commented, rules=rules)
+
+    def dump(self, path):
+        """
+        Write the matrix to a binary file.
+        """
+        strings = [self.strings[i].encode('utf8') for i in range(len(self.strings))]
+        offsets = array.array('q', [0])
+        for s in strings:
+            offsets.append(offsets[-1] + len(s))
+        sections = [
+            ('values', array.array('b', self.values)),
+            ('sources', array.array('i', self.sources)),
+            ('comments', array.array('i', self.comments)),
+            ('string_offsets', offsets),
+            ('strings', b''.join(strings)),
+        ]
+        header = dict(
+            version=FORMAT_VERSION,
+            byteorder=sys.byteorder,
+            glottocodes=self.glottocodes,
+            features=self.features,
+            sections={})
+        # We need to know the size of the header to compute section offsets - which are part of
+        # the header. So we compute offsets relative to the end of the header first:
+        offset = 0
+        for name, data in sections:
+            size = len(data) * (data.itemsize if isinstance(data, array.array) else 1)
+            header['sections'][name] = [
+                offset, size, data.typecode if isinstance(data, array.array) else 'B']
+            offset += size + _padding(size)
+        header = json.dumps(header).encode('utf8')
+        start = len(MAGIC) + 4 + len(header)
+        start += _padding(start)
+
+        with open(str(path), 'wb') as fp:
+            fp.write(MAGIC)
+            fp.write(struct.pack('<I', len(header)))
+            fp.write(header)
+            fp.write(b'\0' * (start - fp.tell()))
+            for _, data in sections:
+                data = data.tobytes() if isinstance(data, array.array) else data
+                fp.write(data)
+                fp.write(b'\0' * _padding(len(data)))
+        return start
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a file written with `ValueMatrix.dump`.
+        """
+        with open(str(path), 'rb') as fp:
+            mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError('{}: not a value matrix file'.format(path))
+        hlen = struct.unpack('<I', mm[len(MAGIC):len(MAGIC) + 4])[0]
+        start = len(MAGIC) + 4 + hlen
+        header = json.loads(mm[len(MAGIC) + 4:start].decode('utf8'))
+        if header['version'] != FORMAT_VERSION or header['byteorder'] != sys.byteorder:
+            raise ValueError('{}: incompatible value matrix file'.format(path))
+        start += _padding(start)
+
+        buffer, sections = memoryview(mm), {}
+        for name, (offset, size, typecode) in header['sections'].items():
+            sections[name] = buffer[start + offset:start + offset + size].cast(typecode)
+        return cls(
+            header['glottocodes'],
+            header['features'],
+            sections['values'],
+            sections['sources'],
+            sections['comments'],
+            MappedStringTable(sections['string_offsets'], sections['strings']))
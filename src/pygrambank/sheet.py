@@ -1,147 +1,59 @@
 import re
-import itertools
+import sys
+import types
+import functools
 import collections
+from collections.abc import MutableMapping
 from termcolor import colored
 
 import attr
 from csvw import dsv
 
 from pygrambank.bib import iter_authoryearpages, mismatch_is_fatal
+from pygrambank.dependencies import check_feature_dependencies
 
 
-def check_feature_dependencies(rows):
-    values = {
-        r.Feature_ID: r
-        for r in rows
-        if r.Feature_ID and r.Value}
-
-    def _value(feat):
-        row = values.get(feat)
-        return row.Value if row else None
-
-    def _comment(feat):
-        row = values.get(feat)
-        return row.Comment if row else None
-
-    def _require_comment(feat, reason):
-        if not _comment(feat):
-            errors.append('{} must have a comment if {}'.format(feat, reason))
-
-    errors = []
-
-    if (_value('GB408')
-        == _value('GB409')
-        == _value('GB410')
-        == '0'
-    ):
-        errors.append("GB408, GB409, and GB410 can't all be 0")
-
-    if (_value('GB131')
-        == _value('GB132')
-        == _value('GB133')
-        == '0'
-    ):
-        errors.append("GB131, GB132, and GB133 can't all be 0")
-
-    if (_value('GB083')
-        == _value('GB084')
-        == _value('GB121')
-        == _value('GB521')
-        == '0'
-        and _value('GB309') == '1'
-    ):
-        reason = 'it is 1 and GB083, GB084, GB121 and GB521 are all 0'
-        _require_comment('GB309', reason)
-
-    if (_value('GB333')
-        == _value('GB334')
-        == _value('GB335')
-        == _value('GB336')
-        == '0'
-    ):
-        reason = 'GB333, GB334, GB335, and GB336 are all 0'
-        for feat in ('GB333', 'GB334', 'GB335', 'GB336'):
-            _require_comment(feat, reason)
-
-    for feat in (
-        'GB026', 'GB303', 'GB320', 'GB166', 'GB197', 'GB129', 'GB285', 'GB336',
-        'GB260', 'GB165', 'GB319'
-    ):
-        if _value(feat) == '1':
-            _require_comment(feat, reason='it is coded 1')
-
-    if (_value('GB265')
-        == _value('GB266')
-        == _value('GB273')
-        == '0'
-    ):
-        reason = 'GB265, GB266, and GB273 are all 0'
-        _require_comment('GB265', reason)
-        _require_comment('GB266', reason)
-        _require_comment('GB273', reason)
-
-    if (_value('GB072')
-        == _value('GB073')
-        == _value('GB074')
-        == _value('GB075')
-        == '0'
-    ):
-        reason = 'GB072, GB073, GB074, and GB075 are all 0'
-        _require_comment('GB074', reason)
-        _require_comment('GB075', reason)
-
-    if _value('GB155') == '1' and _value('GB113') == '0':
-        reason = 'GB155 is 1 and GB113 is 0'
-        _require_comment('GB155', reason)
-        _require_comment('GB113', reason)
-
-    if _value('GB022') == _value('GB023') == '1':
-        reason = 'GB022 and GB023 are both 1'
-        _require_comment('GB022', reason)
-        _require_comment('GB023', reason)
-
-    multistate_features = [
-        # three states
-        ('GB024', 'GB024a', 'GB024b', 3),
-        ('GB025', 'GB025a', 'GB025b', 3),
-        ('GB065', 'GB065a', 'GB065b', 3),
-        ('GB130', 'GB130a', 'GB130b', 3),
-        # four states
-        ('GB193', 'GB193a', 'GB193b', 4),
-        ('GB203', 'GB203a', 'GB203b', 4)]
-    bad_vals_ternary = [
-        ('1', '0', '0'),
-        ('1', '1', '1'),
-        ('2', '1', '1'),
-        ('2', '0', '0'),
-        ('3', '0', '1'),
-        ('3', '1', '0')]
-    bad_vals_quarternary = [
-        ('0', '1', '0'),
-        ('0', '0', '1')]
-    for parent, binary_a, binary_b, n_states in multistate_features:
-        if n_states < 4:
-            vals = bad_vals_ternary
-        else:
-            vals = itertools.chain(bad_vals_ternary, bad_vals_quarternary)
-        for bad_parent, bad_a, bad_b in vals:
-            if (_value(parent) == bad_parent
-                and _value(binary_a) == bad_a
-                and _value(binary_b) == bad_b
-            ):
-                errors.append(
-                    "{} can't be {} if {} is {} and {} is {}".format(
-                        parent, bad_parent,
-                        binary_a, bad_a,
-                        binary_b, bad_b))
-
-        if (n_states < 4
-            and _value(binary_a) == '0'
-            and _value(binary_b) == '0'
-        ):
-            errors.append(f"{binary_a} and {binary_b} can't both be 0")
-
-    return errors
+FEATURE_ID_PATTERN = re.compile('GB[0-9]{3}[a-z]?|(GBDRS.+)|TE[0-9]+|TS[0-9]+$')
+# Comments containing "check" flag datapoints which still need to be checked - unless they
+# document that a check has been done:
+CHECK_COMMENT_PATTERN = re.compile('check', flags=re.IGNORECASE)
+CHECKED_COMMENT_PATTERN = re.compile(
+    'checked by coder|check by coder|wrong import|checked by gb coder', flags=re.IGNORECASE)
+# The columns needed to validate rows and to process the values of a sheet:
+VALUE_COLUMNS = ('Feature_ID', 'Value', 'Source', 'Comment', 'Contributed_Datapoint')
+
+
+@attr.s(frozen=True)
+class ValidationTable:
+    """
+    Immutable lookup tables for the validation of rows, computed once from the feature specs.
+
+    :ivar domains: Mapping of feature IDs to the `frozenset` of valid values.
+    :ivar feature_ids: Mapping of feature IDs to whether they match `FEATURE_ID_PATTERN`.
+    """
+    domains = attr.ib()
+    feature_ids = attr.ib()
+
+    @classmethod
+    def from_features(cls, features):
+        return cls(
+            domains=types.MappingProxyType(
+                {fid: frozenset(f.domain) for fid, f in features.items()}),
+            feature_ids=types.MappingProxyType(
+                {fid: bool(FEATURE_ID_PATTERN.match(fid)) for fid in features}))
+
+    def is_valid_feature_id(self, fid):
+        res = self.feature_ids.get(fid)
+        if res is None:
+            res = bool(FEATURE_ID_PATTERN.match(fid))
+        return res
+
+    @staticmethod
+    def is_check_comment(comment):
+        return bool(
+            CHECK_COMMENT_PATTERN.search(comment)
+            and 'HG' not in comment
+            and not CHECKED_COMMENT_PATTERN.search(comment))
 
 
 @attr.s
@@ -156,23 +68,58 @@ class Source:
         return self.author, self.year, self.in_title
 
 
-@attr.s
+def is_contributed_datapoint_column(name):
+    """
+    The name of the "Contributed datapoint" column varies across sheets.
+    """
+    return bool(name) and ('ontributed' in name) and ('atapoint' in name)
+
+
+def keep_column(name, columns):
+    """
+    :return: `bool` signaling whether column `name` is selected by `columns` - where \
+    "Contributed_Datapoint" selects any variant of the "Contributed datapoint" column name.
+    """
+    return name in columns or (
+        'Contributed_Datapoint' in columns and is_contributed_datapoint_column(name))
+
+
+def parse_contributed_datapoint(s):
+    """
+    :return: `list` of coder abbreviations in a "Contributed datapoint" cell.
+    """
+    if isinstance(s, list):
+        return s
+    return re.findall('[A-Z]+(?=[^A-Z]|$)', s) if s else []
+
+
+@attr.s(slots=True)
 class Row:
     Feature_ID = attr.ib()
     Value = attr.ib()
     Source = attr.ib()
     Comment = attr.ib(default=None)
-    contributed_datapoint = attr.ib(
-        default=attr.Factory(list),
-        converter=lambda s: re.findall('[A-Z]+(?=[^A-Z]|$)', s) if s else [])
+    # The "Contributed datapoint" cell is only parsed when accessed:
+    _contributed_datapoint = attr.ib(default=None, eq=parse_contributed_datapoint)
     Source_comment = attr.ib(default=None)
 
+    @property
+    def contributed_datapoint(self):
+        if not isinstance(self._contributed_datapoint, list):
+            self._contributed_datapoint = parse_contributed_datapoint(
+                self._contributed_datapoint)
+        return self._contributed_datapoint
+
+    @contributed_datapoint.setter
+    def contributed_datapoint(self, value):
+        self._contributed_datapoint = value
+
     @classmethod
     def from_dict(cls, d):
-        fields = list(attr.fields_dict(cls).keys())
+        fields = [f.name.lstrip('_') for f in attr.fields(cls)]
         kw = {}
         for k, v in d.items():
-            if ('ontributed' in k) and ('atapoint' in k):
+            if is_contributed_datapoint_column(k):
                 k = 'contributed_datapoint'
             if k in fields:
                 kw[k] = v
@@ -191,6 +138,123 @@ class Row:
             and (bool(sources) or not mismatch_is_fatal(source_string)))
 
 
+class Header(object):
+    """
+    The column names of a sheet, shared by all `SheetRow`s of the sheet.
+
+    :ivar columns: The column names as found in the sheet - possibly with duplicates.
+    :ivar keys: The distinct column names, i.e. the keys of a row.
+    :ivar positions: The index of the column holding the value for each key - for duplicate \
+    column names the last one, as in a `dict` created from the rows.
+    :ivar surplus: Flag signaling whether surplus cells are kept (keyed with `None`).
+    """
+    __slots__ = ('columns', 'keys', 'positions', 'index', 'surplus', '_derived', '_projections')
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        positions = collections.OrderedDict()
+        for i, col in enumerate(self.columns):
+            positions[col] = i
+        self.keys = tuple(positions)
+        self.positions = tuple(positions.values())
+        self.index = {k: i for i, k in enumerate(self.keys)}
+        self.surplus = True
+        self._derived = {}
+        self._projections = {}
+
+    def derived(self, keys):
+        """
+        :return: The shared `Header` instance for rows with keys `keys`, e.g. after adding a key.
+        """
+        keys = tuple(keys)
+        if keys not in self._derived:
+            self._derived[keys] = Header(keys)
+        return self._derived[keys]
+
+    def projection(self, columns):
+        """
+        :return: The shared `Header` instance for rows restricted to the selected columns \
+        (see `keep_column`), still indexing the cells of the lines of the sheet.
+        """
+        columns = frozenset(columns)
+        if columns not in self._projections:
+            keys = [k for k in self.keys if keep_column(k, columns)]
+            res = Header(keys)
+            res.columns = self.columns
+            res.positions = tuple(self.positions[self.index[k]] for k in keys)
+            res.surplus = False
+            self._projections[columns] = res
+        return self._projections[columns]
+
+
+class SheetRow(MutableMapping):
+    """
+    A row of a sheet, i.e. a mapping of column names to cell values.
+
+    Rather than holding a `dict`, rows store a tuple of values and a reference to the `Header`
+    shared by all rows of a sheet.
+    """
+    __slots__ = ('_header', '_values')
+
+    def __init__(self, header, values):
+        self._header = header
+        self._values = tuple(values)
+
+    @classmethod
+    def from_list(cls, header, row):
+        """
+        Create a row from the cells of a line of the sheet - as `csvw.dsv.reader(dicts=True)` \
+        would, i.e. with `None` for missing cells and a list of surplus cells keyed with `None`.
+        """
+        # Cell values are interned: Feature IDs, values and the feature descriptions copied from
+        # the template sheet are the same across rows or sheets, and thus stored only once.
+        values = [sys.intern(row[i]) if i < len(row) else None for i in header.positions]
+        if header.surplus and len(row) > len(header.columns):
+            values.append(row[len(header.columns):])
+            header = header.derived(header.keys + (None,))
+        return cls(header, values)
+
+    def project(self, columns):
+        """
+        :return: A new `SheetRow` restricted to the selected columns.
+        """
+        header = self._header.projection(columns)
+        return SheetRow(header, [self._values[self._header.index[k]] for k in header.keys])
+
+    def __getitem__(self, key):
+        return self._values[self._header.index[key]]
+
+    def get(self, key, default=None):
+        i = self._header.index.get(key)
+        return default if i is None else self._values[i]
+
+    def __contains__(self, key):
+        return key in self._header.index
+
+    def __setitem__(self, key, value):
+        i = self._header.index.get(key)
+        if i is None:
+            self._header = self._header.derived(self._header.keys + (key,))
+            self._values = self._values + (value,)
+        else:
+            self._values = self._values[:i] + (value,) + self._values[i + 1:]
+
+    def __delitem__(self, key):
+        i = self._header.index[key]
+        self._header = self._header.derived(
+            self._header.keys[:i] + self._header.keys[i + 1:])
+        self._values = self._values[:i] + self._values[i + 1:]
+
+    def __iter__(self):
+        return iter(self._header.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, dict(self.items()))
+
+
 class Sheet(object):
     """
     Processing workflow:
@@ -198,12 +262,21 @@ class Sheet(object):
     name_pattern = re.compile(
         r'(?P<coders>[A-Z]+(-[A-Z]+)*)_(?P<glottocode>[a-z0-9]{4}[0-9]{4})\.tsv$')
 
-    def __init__(self, path):
+    def __init__(self, path, cache=None, columns=None):
+        """
+        :param path: Path of the sheet's TSV file.
+        :param cache: Optional `pygrambank.cache.SheetCache` instance to retrieve rows and \
+        validation results from.
+        :param columns: Optional collection of column names to restrict rows to by default, \
+        see `Sheet.iterrows`.
+        """
         match = self.name_pattern.match(path.name)
         assert match, 'Invalid sheet name: {0}'.format(path.name)
         self.path = path
         self.coders = match.group('coders').replace('CB-PE-AS', 'HunterGatherer').split('-')
         self.glottocode = match.group('glottocode')
+        self.cache = cache
+        self.columns = columns
         self._rows = None
 
     def __str__(self):
@@ -235,15 +308,59 @@ class Sheet(object):
     def _reader(self, **kw):
         return dsv.reader(self.path, delimiter='\t', encoding='utf-8-sig', **kw)
 
-    def iterrows(self):
-        if self._rows is None:
-            self._rows = []
-            for row in self._reader(dicts=True):
-                self._rows.append(row)
-                yield row
+    def _iterdicts(self, columns=None):
+        """
+        Read the rows of the sheet as `SheetRow`s.
+
+        :param columns: Optional collection of column names to restrict rows to.
+        """
+        header = None
+        for row in self._reader():
+            if header is None:
+                header = Header(row)
+                if columns is not None:
+                    header = header.projection(columns)
+            elif row:  # Empty lines are skipped.
+                yield SheetRow.from_list(header, row)
+
+    def iterrows(self, columns=None):
+        """
+        :param columns: Optional collection of column names (e.g. `VALUE_COLUMNS`) to restrict \
+        rows to - defaulting to the `columns` the sheet was created with. Without cache, cells of \
+        other columns are skipped when parsing the file; rows which have already been read in \
+        full - or are read in full to be cached - are projected.
+        """
+        columns = self.columns if columns is None else columns
+        if columns is None:
+            yield from self._iterrows()
+        elif self._cached_rows() is None and not self.cache:
+            # Projected rows are not kept in memory, because they are incomplete.
+            yield from self._iterdicts(columns)
         else:
-            for row in self._rows:
-                yield row
+            for row in self._iterrows():
+                yield row.project(columns)
+
+    def _cached_rows(self):
+        """
+        :return: The rows read before - retrieving them from the cache if necessary - or `None`.
+        """
+        if self._rows is None and self.cache:
+            self._rows = self.cache.rows(self)
+        return self._rows
+
+    def _iterrows(self):
+        if self._cached_rows() is None:
+            if self.cache:
+                self._rows = list(self._iterdicts())
+                self.cache.set_rows(self, self._rows)
+            else:
+                self._rows = []
+                for row in self._iterdicts():
+                    self._rows.append(row)
+                    yield row
+                return
+        for row in self._rows:
+            yield row
 
     def visit(self, row_visitor=None):
         """
@@ -254,7 +371,7 @@ class Sheet(object):
         """
         if row_visitor is None:
             row_visitor = lambda r: r  # noqa: E731
-        rows = list(self.iterrows())
+        rows = list(self._iterrows())
         count = 0
         with dsv.UnicodeWriter(self.path, delimiter='\t', encoding='utf8') as w:
             for i, row in enumerate(rows):
@@ -266,14 +383,33 @@ class Sheet(object):
                     count += 1
         # Make sure calling iterrows again will re-read from disk:
         self._rows = None
+        if self.cache:
+            self.cache.invalidate(self)
         return (len(rows), count)
 
     def valid_row(self, row, api, lineno=None, log=None, features=None):
+        """
+        :param features: Optional collection of the feature IDs in preceding rows, to detect \
+        duplicates.
+        """
+        res = self._validate_row(row, api, lineno=lineno, log=log)
+        if res is None:
+            return False
+        return self._check_duplicate(row, features, lineno=lineno, log=log) and res
+
+    def _validate_row(self, row, api, lineno=None, log=None):
+        """
+        Validate a row without considering other rows of the sheet.
+
+        :return: `None` if the row does not specify a datapoint for a known feature, otherwise \
+        `bool` signaling validity.
+        """
         fid = row.get('Feature_ID')
         if not fid:
-            return False
+            return None
+        table = api.validation_table
         res = True
-        if not re.match('GB[0-9]{3}[a-z]?|(GBDRS.+)|TE[0-9]+|TS[0-9]+$', fid):
+        if not table.is_valid_feature_id(fid):
             if row.get('Value'):
                 if log:
                     log('invalid Feature_ID: {0}'.format(fid),
@@ -281,62 +417,91 @@ class Sheet(object):
                         level='ERROR',
                         row_=row)
             res = False
-        if fid not in api.features:
-            return False
-        if row.get('Value'):
-            if row['Value'] != '?' and row['Value'] not in api.features[row['Feature_ID']].domain:
+        domain = table.domains.get(fid)
+        if domain is None:
+            return None
+        value, source, comment = row.get('Value'), row['Source'], row['Comment']
+        if value:
+            if value != '?' and value not in domain:
                 if log:
-                    log('invalid value: {0}'.format(row['Value']), lineno=lineno, row_=row)
+                    log('invalid value: {0}'.format(value), lineno=lineno, row_=row)
                 res = False
         else:
             res = False
 
-        if row['Value'] and not row['Source']:
+        if value and not source:
             if log:
                 log('value without source', lineno=lineno, level='ERROR', row_=row)
             res = False
-        if row['Source'] and not row['Value']:
+        if source and not value:
             if log:
                 log('source given, but no value', lineno=lineno, level='ERROR', row_=row)
             res = False
-        if row['Comment']:
-            if ('check' in row['Comment'].lower()
-                and 'HG' not in row['Comment']
-                and 'checked by coder' not in row['Comment'].lower()
-                and 'check by coder' not in row['Comment'].lower()
-                and 'wrong import' not in row['Comment'].lower()
-                and 'checked by gb coder' not in row['Comment'].lower()
-            ):
+        if comment:
+            if table.is_check_comment(comment):
                 if log:
                     log('comment contains string "check"', lineno=lineno, level='ERROR', row_=row)
                 res = False
-            if not row['Value']:
+            if not value:
                 if log:
                     log('comment given, but no value', lineno=lineno, level='ERROR', row_=row)
                 res = False
-        if row['Feature_ID'] in (features or set()):
+        return res
+
+    @staticmethod
+    def _check_duplicate(row, features, lineno=None, log=None):
+        if features and row['Feature_ID'] in features:
             if log:
                 log('duplicate value for feature {0}'.format(
                     row['Feature_ID']), lineno=lineno, level='ERROR', row_=row)
-            res = False
-        return res
+            return False
+        return True
 
     def check(self, api, report=None):
-        def log(msg, row_=None, level='ERROR', lineno=-1):
+        """
+        Check the sheet, printing (and appending to `report`) the problems found.
+
+        The file is read and each row is validated only once, checking the header, the rows,
+        multiple codings and feature dependencies in one pass.
+
+        :return: The number of valid rows.
+        """
+        def emit(msg):
+            print(colored('\t'.join(msg), color='red'))
+            if report is not None:
+                report.append(list(msg))
+
+        if self.cache:
+            cached = self.cache.get(self, 'check')
+            if cached:
+                nvalid, messages = cached
+                for msg in messages:
+                    emit(msg)
+                return nvalid
+
+        messages, row_messages = [], []
+
+        def log(msg, row_=None, level='ERROR', lineno=-1, messages=messages):
             msg = [
                 self.path.stem,
                 level,
                 "{}".format(lineno if lineno != -1 else '?'),
                 row_['Feature_ID'] if row_ else '',
                 msg]
-            print(colored('\t'.join(msg), color='red'))
-            if report is not None:
-                report.append(msg)
+            messages.append(msg)
+            if messages is not row_messages:
+                emit(msg)
+
+        # Messages about rows are reported after all messages about the header and empty columns:
+        row_log = functools.partial(log, messages=row_messages)
 
-        # Check the header:
-        empty_index = []
+        header, empty_index, lineno = None, [], 1
+        rows, valid, nvalid, features, comments = [], [], 0, set(), 0
+        codings = {}
         for line, row in enumerate(self._reader()):
             if line == 0:
+                # Check the header:
+                header = Header(row)
                 for col in ['Feature_ID', 'Value', 'Comment', 'Source']:
                     if col not in row:
                         log('missing column {0}'.format(col), lineno=line)
@@ -346,57 +511,86 @@ class Sheet(object):
                 if len(set(row)) != len(row):
                     dupes = collections.Counter([h for h in row if row.count(h) > 1])
                     log('duplicate header column(s) %r' % dupes, lineno=line)
-            else:
-                if not empty_index:
-                    break
-                for j in empty_index:
-                    if row[j]:
-                        log('non-empty cell with empty header: {0}'.format(row[j]),
-                            lineno=line,
-                            level='WARNING')
-
-        res, nvalid, features, comments = [], 0, set(), 0
-        for line, row in enumerate(self.iterrows(), 2):  # +2 to get line number correct
-            if self.valid_row(row, api, lineno=line, log=log, features=features):
+                continue
+
+            for j in empty_index:
+                if row[j]:
+                    log('non-empty cell with empty header: {0}'.format(row[j]),
+                        lineno=line,
+                        level='WARNING')
+            if row == []:  # Empty lines are skipped when reading rows as dicts.
+                continue
+
+            row = SheetRow.from_list(header, row)
+            lineno += 1
+            res = self._validate_row(row, api, lineno=lineno, log=row_log)
+            # Rows are considered for dependency checks and by `itervalues` even if duplicates:
+            valid.append(bool(res))
+            if res is not None:
+                res = self._check_duplicate(row, features, lineno=lineno, log=row_log) and res
+            if res:
                 nvalid += 1
                 comments += 1 if row['Comment'] else 0
             features.add(row['Feature_ID'])
-            res.append(row)
+            codings.setdefault(row['Feature_ID'], []).append(row)
+            rows.append(row)
+
+        for msg in row_messages:
+            messages.append(msg)
+            emit(msg)
+
+        if self._rows is None:
+            self._rows = rows
+            if self.cache and self.cache.rows(self) is None:
+                self.cache.set_rows(self, rows)
 
         if comments < 25:
             log('Less than 25 datapoints have comments', level='WARNING')
 
         try:
-            for gbid, rows in itertools.groupby(
-                sorted(res, key=lambda r: r['Feature_ID']), lambda r: r['Feature_ID']
-            ):
-                rows = list(rows)
-                if len(rows) > 1:
+            for gbid in sorted(codings):
+                if len(codings[gbid]) > 1:
                     # A feature is coded multiple times! If the codings are inconsistent, we raise
                     # an error, otherwise the first value takes precedence.
-                    if len(set(r['Value'] for r in rows)) > 1:
-                        log('inconsistent multiple codings: {0}'.format([r['Value'] for r in rows]))
+                    if len(set(r['Value'] for r in codings[gbid])) > 1:
+                        log('inconsistent multiple codings: {0}'.format(
+                            [r['Value'] for r in codings[gbid]]))
         except:  # pragma: no cover  # noqa
-            for row in res:
+            for row in rows:
                 if not row['Feature_ID']:
                     print(row)
                     break
             print(self.path)
             raise
 
-        for msg in check_feature_dependencies(self.iter_row_objects(api)):
+        for msg in check_feature_dependencies(
+                Row.from_dict(row) for row, is_valid in zip(rows, valid) if is_valid):
             log(msg)  # pragma: nocover
 
+        if self.cache:
+            self.cache.set(self, 'valid', valid)
+            self.cache.set(self, 'check', (nvalid, messages))
         return nvalid
 
     def itervalues(self, api):
+        valid = self.cache.get(self, 'valid') if self.cache else None
+        if valid is not None:
+            for row, is_valid in zip(self.iterrows(), valid):
+                if is_valid:
+                    yield row
+            return
+
+        valid = []
         try:
             for row in self.iterrows():
-                if self.valid_row(row, api):
+                valid.append(self.valid_row(row, api))
+                if valid[-1]:
                     yield row
         except:  # pragma: no cover # noqa: E722
             print(self.path)
             raise
+        if self.cache:
+            self.cache.set(self, 'valid', valid)
 
     def iter_row_objects(self, api):
         for row in self.itervalues(api):
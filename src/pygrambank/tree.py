@@ -0,0 +1,155 @@
+"""
+A compact index of the Glottolog classification tree.
+
+Languoids are numbered in pre-order, i.e. in the order of a depth-first traversal of the tree, so
+that the descendants of a languoid form an interval of integer ids - and checking descendance is a
+range comparison. Rather than lists of descendants per ancestor, we only store one parent and one
+interval end per languoid in flat `array.array`s.
+"""
+import array
+from collections.abc import Mapping
+
+__all__ = ['TreeIndex', 'DescendantsMap', 'InheritedBibkeys']
+
+
+class TreeIndex(object):
+    """
+    :ivar glottocodes: `list` of glottocodes in pre-order - the position being the integer id.
+    :ivar ids: `dict` mapping glottocodes to integer ids.
+    :ivar parents: Sequence of the integer ids of the parents (or -1 for top-level languoids).
+    :ivar ends: Sequence of the (exclusive) ends of the intervals of descendants.
+    """
+    def __init__(self, glottocodes, parents, ends):
+        self.glottocodes = glottocodes
+        self.parents = parents
+        self.ends = ends
+        self.ids = {gc: i for i, gc in enumerate(glottocodes)}
+
+    @classmethod
+    def from_parents(cls, parents):
+        """
+        :param parents: Iterable of pairs (glottocode, parent glottocode or `None`), with parents \
+        preceding their children.
+        """
+        roots, children = [], {}
+        for gc, parent in parents:
+            if parent in children:
+                children[parent].append(gc)
+            else:  # A top-level languoid - or one whose ancestors are not included.
+                roots.append(gc)
+            children[gc] = []
+
+        glottocodes, parent_ids, ends = [], array.array('i'), array.array('i')
+        # Iterative depth-first traversal, where `None` marks the end of a subtree:
+        stack = [(gc, -1) for gc in reversed(roots)]
+        path = []
+        while stack:
+            gc, parent = stack.pop()
+            if gc is None:
+                ends[path.pop()] = len(glottocodes)
+                continue
+            path.append(len(glottocodes))
+            glottocodes.append(gc)
+            parent_ids.append(parent)
+            ends.append(0)
+            stack.append((None, None))
+            stack.extend((child, path[-1]) for child in reversed(children[gc]))
+        return cls(glottocodes, parent_ids, ends)
+
+    @classmethod
+    def from_languoids(cls, languoids):
+        return cls.from_parents(
+            (lang.id, lang.lineage[-1][1] if lang.lineage else None) for lang in languoids)
+
+    def __contains__(self, glottocode):
+        return glottocode in self.ids
+
+    def __len__(self):
+        return len(self.glottocodes)
+
+    def is_descendant(self, glottocode, ancestor):
+        """
+        :return: `bool` signaling whether `glottocode` is `ancestor` or one of its descendants.
+        """
+        i, j = self.ids[glottocode], self.ids[ancestor]
+        return j <= i < self.ends[j]
+
+    def descendants(self, glottocode):
+        """
+        :return: `list` of the glottocodes of the languoid and its descendants, in pre-order.
+        """
+        i = self.ids[glottocode]
+        return self.glottocodes[i:self.ends[i]]
+
+    def ancestry(self, i):
+        """
+        :return: Generator of the integer ids of languoid `i` and its ancestors.
+        """
+        while i >= 0:
+            yield i
+            i = self.parents[i]
+
+
+class DescendantsMap(Mapping):
+    """
+    Mapping of glottocodes to the `list` of glottocodes of the languoid and its descendants.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+
+    def __getitem__(self, glottocode):
+        return self.tree.descendants(glottocode)
+
+    def __contains__(self, glottocode):
+        return glottocode in self.tree
+
+    def __iter__(self):
+        return iter(self.tree.glottocodes)
+
+    def __len__(self):
+        return len(self.tree)
+
+
+class InheritedBibkeys(Mapping):
+    """
+    Mapping of glottocodes to the `frozenset` of keys of the bibliography entries about the
+    languoid or one of its ancestors.
+
+    Keys are stored only with the languoids the entries are about, and inherited sets are resolved
+    on access. As with a `collections.defaultdict`, looking up a glottocode without entries
+    returns an empty set, while iteration only yields glottocodes with entries.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.bibkeys = {}
+
+    def add(self, glottocode, bibkey):
+        self.bibkeys.setdefault(self.tree.ids[glottocode], set()).add(bibkey)
+
+    def _ancestry(self, glottocode):
+        i = self.tree.ids.get(glottocode)
+        return () if i is None else self.tree.ancestry(i)
+
+    def __getitem__(self, glottocode):
+        return frozenset().union(
+            *[self.bibkeys[i] for i in self._ancestry(glottocode) if i in self.bibkeys])
+
+    def get(self, glottocode, default=None):
+        return self[glottocode] if glottocode in self else default
+
+    def __contains__(self, glottocode):
+        return any(i in self.bibkeys for i in self._ancestry(glottocode))
+
+    def _intervals(self):
+        end = -1
+        for i in sorted(self.bibkeys):
+            if i >= end:  # Not within the interval of an ancestor with entries.
+                end = self.tree.ends[i]
+                yield i, end
+
+    def __iter__(self):
+        for start, end in self._intervals():
+            yield from self.tree.glottocodes[start:end]
+
+    def __len__(self):
+        return sum(end - start for start, end in self._intervals())
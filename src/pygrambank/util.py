@@ -5,8 +5,6 @@ import collections
 import pathlib
 
 from csvw import dsv
-import openpyxl
-import xlrd
 
 from pygrambank.sheet import Sheet
 
@@ -105,44 +103,69 @@ def iter_tsv(fname):
 
 
 def iter_xlsx(fname):
+    """
+    Read the active sheet of an `.xlsx` workbook.
+
+    The workbook is read in streaming (read-only) mode and no rows are kept in memory, so memory
+    usage does not depend on the (possibly bloated) size of the spreadsheet.
+    """
+    import openpyxl
+
     with warnings.catch_warnings():
         warnings.simplefilter('ignore')
-        sheet = openpyxl.load_workbook(str(fname), data_only=True).active
-
-        header = None
-        empty_rows = 0
-        empty_cols, data = [], []
-        skip_cols = set()
-        for i, row in enumerate(sheet.rows):
-            if i == 0:
+        wb = openpyxl.load_workbook(str(fname), data_only=True, read_only=True)
+        try:
+            sheet = wb.active
+            # The <dimension> tag in files written by other tools is often wrong, and trusting it
+            # would silently cut rows short or drop them. So we always determine the size with a
+            # (streaming) scan - which is also needed to pad rows to the same length.
+            sheet.max_row = sheet.max_column = None
+            if any(sheet.iter_rows()):  # `calculate_dimension` fails for empty sheets.
+                sheet.calculate_dimension(force=True)
+
+            # There's a couple of sheets with > 10,000 columns, labeled with "Column<no>".
+            # We cut these out to reduce TSV bloat. Since these are typically trailing columns,
+            # we don't even read the cells beyond the last regular column.
+            skip_cols, max_col = set(), None
+            for row in sheet.iter_rows(min_row=1, max_row=1):
                 for j, c in enumerate(row):
-                    # There's a couple of sheets with > 10,000 columns, labeled with "Column<no>".
-                    # We cut these out to reduce TSV bloat.
                     if re.match('Column[0-9]+$', '{0}'.format(c.value)):  # pragma: no cover
                         skip_cols.add(j)
-            row = [_read_excel_value(c.value) for j, c in enumerate(row) if j not in skip_cols]
-            if set(row) == {''}:  # pragma: no cover
-                empty_rows += 1
-                if empty_rows > 1000:
-                    # There's a couple of sheets with > 100,000 (mostly empty) rows.
-                    # After encountering more than 1,000, we stop reading.
-                    break
+                if skip_cols:  # pragma: no cover
+                    max_col = max(
+                        [j + 1 for j in range(len(row)) if j not in skip_cols], default=None)
+
+            header = None
+            empty_rows = 0
+            empty_cols, nonempty_cols = [], set()
+            for row in sheet.iter_rows(min_row=1, max_col=max_col):
+                row = [
+                    _read_excel_value(c.value) for j, c in enumerate(row) if j not in skip_cols]
+                if set(row) <= {''}:  # pragma: no cover
+                    empty_rows += 1
+                    if empty_rows > 1000:
+                        # There's a couple of sheets with > 100,000 (mostly empty) rows.
+                        # After encountering more than 1,000, we stop reading.
+                        break
+                    else:
+                        continue
+                if header is None:
+                    header = row
+                    empty_cols = [i for i, c in enumerate(header) if not c]
                 else:
-                    continue
-            if header is None:
-                header = row
-                empty_cols = [i for i, c in enumerate(header) if not c]
-            else:
-                assert len(header) == len(row), 'Header and row length mismatch'
-                data.append(row)
-                yield _normalized_row(collections.OrderedDict(zip(header, row)))
+                    assert len(header) == len(row), 'Header and row length mismatch'
+                    nonempty_cols.update(i for i in empty_cols if row[i])
+                    yield _normalized_row(collections.OrderedDict(zip(header, row)))
+        finally:
+            wb.close()
 
         for i in empty_cols:  # pragma: no cover
-            assert all(not bool(r[i]) for r in data), \
-                'Empty header for non-empty column: {0}'.format(i)
+            assert i not in nonempty_cols, 'Empty header for non-empty column: {0}'.format(i)
 
 
 def iter_xls(fname):
+    import xlrd
+
     wb = xlrd.open_workbook(str(fname))
     rows_by_sheetname = collections.defaultdict(list)
     for sheet in wb.sheets():  # We read all sheets in the workbook.
@@ -189,13 +212,24 @@ def iter_csv(fname):
         yield r
 
 
+# Functions to read the rows of spreadsheets, keyed by lowercase file name suffix:
+READERS = {
+    '.xlsx': iter_xlsx,
+    '.xls': iter_xls,
+    '.csv': iter_csv,
+    '.tsv': iter_tsv,
+}
+
+
+def reader(path):
+    """
+    :return: The function to read the rows of the spreadsheet at `path` or `None`.
+    """
+    return READERS.get(path.suffix.lower())
+
+
 def write_tsv(in_, out_, glottocode):
-    rows = list({
-        '.xlsx': iter_xlsx,
-        '.xls': iter_xls,
-        '.csv': iter_csv,
-        '.tsv': iter_tsv,
-    }[in_.suffix](in_))
+    rows = list(reader(in_)(in_))
 
     i = 0
     with dsv.UnicodeWriter(out_, delimiter='\t') as w:
@@ -21,3 +21,5 @@ def test_bib(api):
 
 def test_sheets(api):
     assert len(list(api.iter_sheets())) == 2
+    for sheet in api.iter_sheets(columns=['Feature_ID', 'Value']):
+        assert all(list(row) == ['Feature_ID', 'Value'] for row in sheet.iterrows())
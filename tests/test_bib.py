@@ -50,3 +50,20 @@ def test_von_part():
         'jr': 'Jr.'
     }]
     assert list(bib.parse_authors(author_string)) == authors
+
+
+def test_is_unpublished():
+    assert bib.is_unpublished('Meier (pers. comm.)')
+    assert bib.is_unpublished('http://example.org')
+    assert not bib.is_unpublished('See http://example.org')
+    assert not bib.is_unpublished('Meier 2001: 12')
+
+
+def test_parse_citations():
+    bib.parse_citations.cache_clear()
+    res = bib.parse_citations('Meier 2001: 12; Müller (p.c.)')
+    assert res == (('Meier', '2001', '12', ''),)
+    assert bib.parse_citations('Meier 2001: 12; Müller (p.c.)') is res
+    info = bib.parse_citations.cache_info()
+    assert info.hits == 1 and info.misses == 1
+    assert list(bib.iter_authoryearpages('Meier 2001: 12; Müller (p.c.)')) == list(res)
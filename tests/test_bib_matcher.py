@@ -1,6 +1,15 @@
+import types
+import shutil
+import pathlib
+import subprocess
+
+import pytest
 from pycldf.sources import Source
-from pygrambank.cldf import BibliographyMatcher
-from pygrambank.sheet import Row
+from pygrambank.cldf import (
+    BibliographyIndex, BibliographyMatcher, GlottologGB, glottolog_version, load_bibliography,
+    read_glottolog_tree, resolve_sources, write_glottolog_snapshot,
+)
+from pygrambank.sheet import Row, Sheet
 
 
 # Make a mock bibliography for testing
@@ -330,3 +339,119 @@ def test_nothing_but_von_parts():
     unresolved = bib_matcher.get_unresolved_citations()
     expected_errors = [(('Van der von van', '2012', ENGLISH), 1)]
     assert unresolved == expected_errors
+
+
+def test_bibliography_index():
+    index = BibliographyIndex(BIBLIOGRAPHY, BIBKEYS_BY_GLOTTOCODE)
+    assert [c[0] for c in index.candidates(ENGLISH, 'Fictionman', '2001')] == ['Fictionman2001']
+    assert sorted(c[0] for c in index.candidates(ENGLISH, 'Writealot', '2012')) == [
+        'Writealot2012_Another', 'Writealot2012_First']
+    assert not index.candidates(ENGLISH, 'Fictionman', '2012')
+    assert [c[0] for c in index.candidates('melp1238', 'Strauss', 'no date')] == [
+        's:Strauss:Melpa']
+
+    # Indexes can be shared between matchers:
+    bib_matcher = BibliographyMatcher(BIBLIOGRAPHY, BIBKEYS_BY_GLOTTOCODE, index=index)
+    row = Row(None, None, 'Fictionman 2001')
+    bib_matcher.add_resolved_citation_to_row(ENGLISH, row)
+    assert row.Source == ['Fictionman2001']
+
+
+def test_glottolog_version(tmp_path):
+    glottolog = tmp_path / 'glottolog'
+    shutil.copytree(str(pathlib.Path(__file__).parent / 'glottolog'), str(glottolog))
+    version = glottolog_version(glottolog)
+    assert version == glottolog_version(glottolog)
+
+    for cmd in [['init', '-q'], ['add', '.'], ['commit', '-q', '-m', 'init']]:
+        subprocess.check_call(
+            ['git', '-C', str(glottolog), '-c', 'user.name=x', '-c', 'user.email=x@example.org']
+            + cmd)
+    commit = glottolog_version(glottolog)
+    assert commit != version and len(commit) == 40
+
+    # Uncommitted changes are detected:
+    with (glottolog / 'references' / 'bibtex' / 'hh.bib').open('a') as fp:
+        fp.write('\n')
+    assert glottolog_version(glottolog) not in (commit, version)
+
+
+def test_load_bibliography(api):
+    entries, bibkeys_by_glottocode = load_bibliography(
+        GlottologGB(pathlib.Path(__file__).parent / 'glottolog'), api)
+    assert entries
+    assert all(key in entries for keys in bibkeys_by_glottocode.values() for key in keys)
+
+
+def test_glottolog_snapshot(api, tmp_path, capsys):
+    glottolog = GlottologGB(pathlib.Path(__file__).parent / 'glottolog')
+    assert write_glottolog_snapshot(glottolog, tmp_path / 'snapshot.json') == 3
+    snapshot = GlottologGB(pathlib.Path(__file__).parent / 'glottolog', tmp_path / 'snapshot.json')
+
+    assert snapshot.descendants_map == glottolog.descendants_map
+    assert {k: lg.id for k, lg in snapshot.languoids_by_ids.items()} == \
+        {k: lg.id for k, lg in glottolog.languoids_by_ids.items()}
+    assert load_bibliography(snapshot, api) == load_bibliography(glottolog, api)
+    for gc in ['abcd1234', 'bcde1234']:
+        sheet = Sheet(pathlib.Path('ABC_{}.tsv'.format(gc)))
+        assert sheet.metadata(snapshot) == sheet.metadata(glottolog)
+
+    assert write_glottolog_snapshot(glottolog, tmp_path / 'snapshot.json', {'bcde1234'}) == 2
+    assert [lg.id for lg in GlottologGB(snapshot=tmp_path / 'snapshot.json').languoids] == \
+        ['abcd1234', 'bcde1234']
+
+    (tmp_path / 'snapshot.json').write_text('{"version": 0}', encoding='utf8')
+    with pytest.raises(ValueError):
+        _ = GlottologGB(snapshot=tmp_path / 'snapshot.json').languoids
+
+
+def test_GlottologGB_workers(api):
+    calls = []
+    glottolog = GlottologGB(pathlib.Path(__file__).parent / 'glottolog')
+    parallel = GlottologGB(
+        pathlib.Path(__file__).parent / 'glottolog',
+        workers=2,
+        progress=lambda *args: calls.append(args))
+    parallel.progress_interval = 2
+
+    total, rows = read_glottolog_tree(parallel.api.tree, 2)
+    assert total == 3 and isinstance(rows, types.GeneratorType)
+    assert [row[0] for row in rows] == [lg.id for lg in glottolog.languoids]
+
+    assert parallel.descendants_map == glottolog.descendants_map
+    assert [(count, total) for count, total, _ in calls] == [(2, 3), (3, 3)]
+    assert {k: lg.id for k, lg in parallel.languoids_by_ids.items()} == \
+        {k: lg.id for k, lg in glottolog.languoids_by_ids.items()}
+    assert load_bibliography(parallel, api) == load_bibliography(glottolog, api)
+    for gc in ['abcd1234', 'bcde1234']:
+        sheet = Sheet(pathlib.Path('ABC_{}.tsv'.format(gc)))
+        assert sheet.metadata(parallel) == sheet.metadata(glottolog)
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_resolve_sources(workers):
+    sources = [
+        'Fictionman 2000: 12', 'Santa Clause (1982)', 'Müller (p.c.)', '',
+        'Fictionman 2001; Writealot 2012_another', 'Fictionman 2000: 12', 'Strauß n.d.']
+
+    def make_sheets():
+        return [
+            (ENGLISH, [Row(None, None, s) for s in sources]),
+            ('melp1238', [Row(None, None, s) for s in reversed(sources)])]
+
+    expected = make_sheets()
+    matchers = []
+    for glottocode, rows in expected:
+        matchers.append(BibliographyMatcher(BIBLIOGRAPHY, BIBKEYS_BY_GLOTTOCODE))
+        for row in rows:
+            matchers[-1].add_resolved_citation_to_row(glottocode, row)
+
+    sheets = make_sheets()
+    res = resolve_sources(sheets, BIBLIOGRAPHY, BIBKEYS_BY_GLOTTOCODE, workers=workers)
+    assert len(res) == 2
+    for m1, m2, (_, rows1), (_, rows2) in zip(matchers, res, expected, sheets):
+        assert m1.get_sources() == m2.get_sources()
+        assert m1.get_unresolved_citations() == m2.get_unresolved_citations()
+        assert [(r.Source, r.Source_comment) for r in rows1] == \
+            [(r.Source, r.Source_comment) for r in rows2]
+    assert res[0].has_sources() and res[1].has_sources()
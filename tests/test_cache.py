@@ -0,0 +1,103 @@
+import os
+
+from pygrambank.api import Grambank
+from pygrambank.cache import fingerprint, load, memoized
+
+
+def test_fingerprint(tmp_path):
+    p = tmp_path / 'test.txt'
+    p.write_text('abc', encoding='utf8')
+    fp = fingerprint(p, tmp_path)
+    assert fp == fingerprint(p, tmp_path)
+    p.write_text('abcd', encoding='utf8')
+    assert fp != fingerprint(p, tmp_path)
+
+
+def test_load(tmp_path):
+    p = tmp_path / 'test.pickle'
+    assert load(p) is None
+    # A pickle referencing a class which does not exist (anymore):
+    p.write_bytes(b'cpygrambank.sheet\nNoSuchClass\n.')
+    assert load(p) is None
+
+
+def test_memoized(tmp_path, mocker):
+    func = mocker.Mock(return_value=1)
+    assert memoized(tmp_path, 'key', func) == memoized(tmp_path, 'key', func) == 1
+    assert func.call_count == 1
+
+    # Data cached by another version of pygrambank is not used - and removed:
+    mocker.patch('pygrambank.cache.version', mocker.Mock(return_value='other'))
+    assert memoized(tmp_path, 'key', func) == 1
+    assert func.call_count == 2
+    assert len(list(tmp_path.glob('*.pickle'))) == 1
+
+
+def test_SheetCache(repos, mocker):
+    api = Grambank(repos, cache=True)
+    sheet = [s for s in api.iter_sheets() if s.path.stem.startswith('ABBR')][0]
+    report = []
+    nvalid = sheet.check(api, report=report)
+    values = list(sheet.itervalues(api))
+    assert api.cache_dir.joinpath('sheets', 'original_sheets').exists()
+
+    # A new API instance reads rows and validation results from the cache:
+    api = Grambank(repos, cache=True)
+    sheet = [s for s in api.iter_sheets() if s.path.stem.startswith('ABBR')][0]
+    reader = mocker.patch.object(sheet, '_reader')
+    valid_row = mocker.patch.object(sheet, 'valid_row')
+    report2 = []
+    assert sheet.check(api, report=report2) == nvalid
+    assert report == report2
+    assert list(sheet.itervalues(api)) == values
+    assert not reader.called and not valid_row.called
+
+    # Touching the file does not invalidate the cache ...
+    os.utime(sheet.path, ns=(0, 0))
+    api = Grambank(repos, cache=True)
+    sheet = [s for s in api.iter_sheets() if s.path.stem.startswith('ABBR')][0]
+    assert sheet.cache.rows(sheet) is not None
+
+    # Entries written by another version of pygrambank are not used:
+    mocker.patch('pygrambank.cache.version', mocker.Mock(return_value='other'))
+    api = Grambank(repos, cache=True)
+    sheet = [s for s in api.iter_sheets() if s.path.stem.startswith('ABBR')][0]
+    assert sheet.cache.rows(sheet) is None
+    mocker.stopall()
+
+    # ... but changing it does:
+    sheet.visit()
+    sheet.path.write_text(
+        sheet.path.read_text(encoding='utf8').replace('Author 2020', 'Author 2021'),
+        encoding='utf8')
+    api = Grambank(repos, cache=True)
+    sheet = [s for s in api.iter_sheets() if s.path.stem.startswith('ABBR')][0]
+    assert sheet.cache.rows(sheet) is None
+    assert 'Author 2021' in [r['Source'] for r in sheet.iterrows()]
+
+
+def test_SheetCache_visit(repos):
+    api = Grambank(repos, cache=True)
+    sheet = [s for s in api.iter_sheets() if s.path.stem.startswith('ABBR')][0]
+    assert len(list(sheet.iterrows())) == 2
+    assert sheet.visit(lambda r: False) == (2, 0)
+    assert list(sheet.iterrows()) == []
+    # Other `Sheet` instances using the same cache see the change as well:
+    assert [list(s.iterrows()) for s in api.iter_sheets() if s.path == sheet.path] == [[]]
+
+    # Changes made without `visit` are detected, too:
+    sheet.path.write_text('Feature_ID\tValue\tSource\tComment\nGB020\t1\tx\t\n', encoding='utf8')
+    assert [r['Value'] for s in api.iter_sheets() if s.path == sheet.path
+            for r in s.iterrows()] == ['1']
+
+
+def test_SheetCache_columns(repos, mocker):
+    # Reading rows restricted to the value columns - as `value_matrix` does - fills the cache:
+    api = Grambank(repos, cache=True)
+    m = api.value_matrix()
+    assert len(list(api.cache_dir.joinpath('sheets', 'original_sheets').glob('*.pickle'))) == 2
+
+    api = Grambank(repos, cache=True)
+    reader = mocker.patch('pygrambank.sheet.Sheet._reader')
+    assert list(api.value_matrix().values) == list(m.values)
+    assert not reader.called
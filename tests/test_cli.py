@@ -1,5 +1,6 @@
 import shutil
 import pathlib
+import subprocess
 import argparse
 import collections
 
@@ -141,12 +142,193 @@ def test_check(repos, capsys, tmp_path):
         '--filename', str(repos / 'original_sheets' / 'ABBR_abcd1234.tsv')])
 
 
+def test_check_workers(repos, tmp_path, capsys):
+    from pygrambank.api import Grambank
+    from pygrambank.commands.check import check_sheets
+
+    # Only the selected sheet for a language is checked:
+    api = Grambank(repos)
+    selected, checked = check_sheets(api, list(api.iter_sheets()), 2)
+    assert [s.path.stem for s in selected] == ['ABBR_abcd1234']
+    assert list(checked) == [repos / 'original_sheets' / 'ABBR_abcd1234.tsv']
+
+    main(['--repos', str(repos), 'check', '--report', str(tmp_path / 'serial.tsv')])
+    main([
+        '--repos', str(repos),
+        'check', '--workers', '2', '--report', str(tmp_path / 'parallel.tsv')])
+    assert (tmp_path / 'serial.tsv').read_text(encoding='utf8') == \
+        (tmp_path / 'parallel.tsv').read_text(encoding='utf8')
+    for _ in range(2):
+        main([
+            '--repos', str(repos), '--cache',
+            'check', '--report', str(tmp_path / 'cached.tsv')])
+        assert (tmp_path / 'serial.tsv').read_text(encoding='utf8') == \
+            (tmp_path / 'cached.tsv').read_text(encoding='utf8')
+
+    with pytest.raises(SystemExit):
+        main([
+            '--repos', str(repos), 'check', '--workers', '2',
+            '--filename', str(repos / 'original_sheets' / 'NOVALS_abcd1234.tsv')])
+    assert '--workers cannot be combined with --filename' in capsys.readouterr()[0]
+
+
+def test_check_since(repos, tmp_path, capsys):
+    def git(*args):
+        subprocess.check_call(
+            ['git', '-C', str(repos), '-c', 'user.name=x', '-c', 'user.email=x@example.org']
+            + list(args),
+            stdout=subprocess.DEVNULL)
+
+    def check(*args):
+        report = tmp_path / 'report.tsv'
+        if report.exists():
+            report.unlink()
+        main(['--repos', str(repos), 'check', '--report', str(report)] + list(args))
+        return report.read_text(encoding='utf8') if report.exists() else ''
+
+    # Not a git repository:
+    assert main(['--repos', str(repos), 'check', '--since', 'HEAD']) == 1
+
+    git('init', '-q')
+    git('add', '.')
+    git('commit', '-q', '-m', 'init')
+    assert not check('--since', 'HEAD')
+    assert main(['--repos', str(repos), 'check', '--since', 'nosuchrev']) == 1
+    with pytest.raises(SystemExit):
+        main([
+            '--repos', str(repos), 'check', '--since', 'HEAD',
+            '--filename', str(repos / 'original_sheets' / 'NOVALS_abcd1234.tsv')])
+    assert '--since cannot be combined with --filename' in capsys.readouterr()[0]
+
+    shutil.copy(
+        str(repos / 'original_sheets' / 'NOVALS_abcd1234.tsv'),
+        str(repos / 'original_sheets' / 'NEW_abcd1234.tsv'))
+    assert check('--since', 'HEAD') == check()
+
+
+def test_export(repos, tmp_path):
+    from pygrambank.matrix import ValueMatrix
+
+    main(['--repos', str(repos), 'export', str(tmp_path / 'values.bin')])
+    assert ValueMatrix.load(tmp_path / 'values.bin')['abcd1234', 'GB020'] == '?'
+
+
+@pytest.mark.parametrize('workers', [[], ['--workers', '2']])
+def test_conflicts(repos, tmp_path, workers):
+    outdir = tmp_path / 'conflicts'
+    (repos / 'quarantine').mkdir()
+    invalid = repos / 'original_sheets' / 'XYZ_bcde1234.tsv'
+    invalid.write_text('Feature_ID\tValue\tSource\nGB020\t1\tx\n', encoding='utf8')
+    shutil.copy(str(invalid), str(repos / 'quarantine' / 'ABC_bcde1234.tsv'))
+
+    # A conflict sheet cannot be written for bcde1234, so no sheets are moved:
+    assert main(['--repos', str(repos), 'conflicts', '--outdir', str(outdir)] + workers) == 1
+    assert (outdir / 'abcd1234.tsv').exists() and not (outdir / 'bcde1234.tsv').exists()
+    assert len(list((repos / 'original_sheets').iterdir())) == 3
+
+    invalid.unlink()
+    assert main(['--repos', str(repos), 'conflicts', '--outdir', str(outdir)] + workers) == 0
+    assert len(list((repos / 'original_sheets').iterdir())) == 0
+    assert len(list((repos / 'quarantine').iterdir())) == 3
+    assert 'GB020\t?' in (outdir / 'abcd1234.tsv').read_text(encoding='utf8')
+
+
+def test_glottolog_snapshot(repos, tmp_path):
+    from pygrambank.cldf import GlottologGB
+
+    main([
+        '--repos', str(repos),
+        'glottolog_snapshot',
+        '--sheets-only',
+        str(pathlib.Path(__file__).parent / 'glottolog'),
+        str(tmp_path / 'snapshot.json')])
+    assert [lg.id for lg in GlottologGB(snapshot=tmp_path / 'snapshot.json').languoids] == \
+        ['abcd1234']
+
+
+@pytest.mark.parametrize('workers', [[], ['--workers', '2']])
+def test_import_sheets(repos, tmp_path, capsys, workers):
+    indir, outdir = tmp_path / 'in', tmp_path / 'out'
+    indir.mkdir()
+    outdir.mkdir()
+    obsolete = repos / 'obsolete_sheets'
+    shutil.copy(
+        str(obsolete / 'Other Coder_Lang [NOCODE_lang].xlsx'),
+        str(indir / 'Hedvig Skirgård_Lang [abcd1234].xlsx'))
+    shutil.copy(
+        str(obsolete / 'The Other Coder_Language [iso].tsv'),
+        str(indir / 'HS-HJH_bcde1234.tsv'))
+    shutil.copy(
+        str(obsolete / 'The Coder_Language [iso].csv'),
+        str(indir / 'The Coder_Language [abcd1234].csv'))
+    indir.joinpath('HJH_cdef1234.xlsx').write_text('not a workbook', encoding='utf8')
+
+    main(
+        ['--repos', str(repos), 'import_sheets', str(indir), '--outdir', str(outdir)] + workers)
+    out, _ = capsys.readouterr()
+    assert 'unknown coder: The Coder' in out
+    assert 'HJH_cdef1234.xlsx' in out
+    assert sorted(p.name for p in outdir.iterdir()) == ['HS-HJH_bcde1234.tsv', 'HS_abcd1234.tsv']
+    assert 'Arsjo' in outdir.joinpath('HS_abcd1234.tsv').read_text(encoding='utf8')
+
+    main(['--repos', str(repos), 'import_sheets', str(indir), '--outdir', str(outdir)])
+    out, _ = capsys.readouterr()
+    assert 'sheet exists' in out
+
+
+def test_import_sheets_force(repos, tmp_path, capsys):
+    indir, outdir = tmp_path / 'in', repos / 'original_sheets'
+    indir.mkdir()
+    existing = outdir.joinpath('ABBR_abcd1234.tsv').read_text(encoding='utf8')
+    shutil.copy(
+        str(repos / 'obsolete_sheets' / 'Other Coder_Lang [NOCODE_lang].xlsx'),
+        str(indir / 'HS_abcd1234.XLSX'))
+    indir.joinpath('ABBR_abcd1234.xlsx').write_text('not a workbook', encoding='utf8')
+    indir.joinpath('HS_bcde1234.csv').write_text('Feature_ID,Value\n', encoding='utf8')
+    indir.joinpath('HS_bcde1234.tsv').write_text('Feature_ID\tValue\n', encoding='utf8')
+
+    main(['--repos', str(repos), 'import_sheets', str(indir), '--force'])
+    out, _ = capsys.readouterr()
+    # Suffixes are matched case-insensitively:
+    assert 'Arsjo' in outdir.joinpath('HS_abcd1234.tsv').read_text(encoding='utf8')
+    # A failed conversion leaves an existing sheet alone:
+    assert outdir.joinpath('ABBR_abcd1234.tsv').read_text(encoding='utf8') == existing
+    # Multiple files for the same sheet are not imported:
+    assert out.count('multiple files for sheet') == 2
+    assert not outdir.joinpath('HS_bcde1234.tsv').exists()
+    # No temporary files are left in the sheets directory:
+    assert sorted(p.name for p in outdir.iterdir()) == [
+        'ABBR_abcd1234.tsv', 'HS_abcd1234.tsv', 'NOVALS_abcd1234.tsv']
+
+
 def test_sourcelookup(repos, capsys):
     main([
         '--repos', str(repos),
         'sourcelookup',
         str(pathlib.Path(__file__).parent / 'glottolog'),
         str(repos / 'original_sheets' / 'ABBR_abcd1234.tsv')])
+    out, _ = capsys.readouterr()
+    main([
+        '--repos', str(repos),
+        'sourcelookup',
+        '--workers', '2',
+        str(pathlib.Path(__file__).parent / 'glottolog'),
+        str(repos / 'original_sheets' / 'ABBR_abcd1234.tsv')])
+    assert capsys.readouterr()[0] == out
+
+
+def test_sourcelookup_cache(repos, capsys):
+    for _ in range(2):
+        main([
+            '--repos', str(repos),
+            '--cache',
+            'sourcelookup',
+            str(pathlib.Path(__file__).parent / 'glottolog'),
+            str(repos / 'original_sheets' / 'ABBR_abcd1234.tsv')])
+        out, _ = capsys.readouterr()
+        assert 'Source look-up' in out
+    assert 'Reading language data' not in out
+    assert len(list((repos / '.grambank-cache' / 'bibliography').glob('*.pickle'))) == 1
 
 
 def test_fix(repos):
@@ -171,6 +353,24 @@ def test_features(repos, capsys, mocker):
     out, err = capsys.readouterr()
     assert 'Patron' in out
 
+    with pytest.raises(SystemExit):
+        main([
+            '--repos', str(repos), 'features', '--rebuild-cache',
+            '--wiki_repos', str(pathlib.Path(__file__).parent / 'grambank.wiki'),
+        ])
+    assert '--rebuild-cache requires --cache' in capsys.readouterr()[0]
+    assert not (repos / '.grambank-cache').exists()
+    main([
+        '--repos', str(repos), '--cache', 'features', '--rebuild-cache',
+        '--wiki_repos', str(pathlib.Path(__file__).parent / 'grambank.wiki'),
+    ])
+    assert len(list((repos / '.grambank-cache' / 'features').glob('*.pickle'))) == 1
+    main([
+        '--repos', str(repos), '--cache', 'features',
+        '--wiki_repos', str(pathlib.Path(__file__).parent / 'grambank.wiki'),
+    ])
+    assert capsys.readouterr()[0] == out
+
 
 def test_check_encoding_for_repl_chars():
     line = "�We don't want those dreaded ��� characters anywhere in our stuff!�"
@@ -212,3 +412,67 @@ def test_check_encoding(tmp_path):
         f.write('Zum Gruße!\n'.encode('cp1252'))
 
     main(['check_encoding', good_utf8, corrupted_utf8, not_utf8, mixed_encodings])
+
+
+def test_sourcelookup_serve(repos, capsys):
+    import threading
+    from pygrambank.api import Grambank
+    from pygrambank.commands.sourcelookup import Bibliography, make_server
+
+    glottolog = pathlib.Path(__file__).parent / 'glottolog'
+    sheet = repos / 'original_sheets' / 'ABBR_abcd1234.tsv'
+    main(['--repos', str(repos), 'sourcelookup', str(glottolog), str(sheet)])
+    expected, _ = capsys.readouterr()
+
+    api = Grambank(repos)
+    server = make_server(api, Bibliography.load(api, glottolog), port=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        port = str(server.server_address[1])
+        capsys.readouterr()
+        assert main([
+            '--repos', str(repos), 'sourcelookup', '--client', '--port', port,
+            str(glottolog), str(sheet)]) == 0
+        out, _ = capsys.readouterr()
+        assert out and out in expected
+
+        # The server only answers look-ups for the Glottolog data it loaded:
+        assert main([
+            '--repos', str(repos), 'sourcelookup', '--client', '--port', port,
+            str(repos), str(sheet)]) == 1
+        out, _ = capsys.readouterr()
+        assert out.startswith('ERROR:')
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_lazy_commands(capsys):
+    import sys
+
+    for mod in ['pygrambank.commands.stats', 'pygrambank.commands.fix']:
+        sys.modules.pop(mod, None)
+    with pytest.raises(SystemExit):
+        main(['--help'])
+    out, _ = capsys.readouterr()
+    assert 'sourcelookup' in out and 'Lookup the references' in out
+    assert 'pygrambank.commands.stats' not in sys.modules
+
+    with pytest.raises(SystemExit):
+        main(['stats', '--help'])
+    assert 'pygrambank.commands.stats' in sys.modules
+    assert 'pygrambank.commands.fix' not in sys.modules
+
+    # The command is the first positional argument after the global options:
+    sys.modules.pop('pygrambank.commands.stats', None)
+    with pytest.raises(SystemExit):
+        main(['--repos', 'stats', 'fix', '--help'])
+    assert 'pygrambank.commands.fix' in sys.modules
+    assert 'pygrambank.commands.stats' not in sys.modules
+
+    # Invalid arguments are reported with all commands registered:
+    with pytest.raises(SystemExit):
+        main(['--repos'])
+    assert 'pygrambank.commands.stats' in sys.modules
@@ -714,6 +714,64 @@ class UpdatingValues(unittest.TestCase):
         self.assertEqual(new_conflicts, expected)
 
 
+class MergingSheets(unittest.TestCase):
+
+    @staticmethod
+    def sheet_row(feature, value, sheet):
+        return c.PotentialConflict(
+            sheet_row={
+                'Feature_ID': feature,
+                'Value': value,
+                'Source': 'source {} (p.c.)'.format(sheet),
+                'Comment': '',
+                'Contributed_Datapoint': 'XYZ',
+            },
+            sheet_name=sheet,
+            warnings='')
+
+    @staticmethod
+    def conflict_row(feature, value, conflict, sheet):
+        return {
+            'Feature_ID': feature,
+            'Value': value,
+            'Conflict': conflict,
+            'Classification of conflict': '',
+            'Select': '',
+            'Sheet': sheet,
+            'Source': 'source {} (p.c.)'.format(sheet),
+            'Contributed_Datapoint': 'XYZ',
+            'Comment': '',
+            'Warnings': ''}
+
+    def test_several_sheets(self):
+        sheet_rows = [
+            self.sheet_row('GB020', '1', 'ABC_abcd1234'),
+            self.sheet_row('GB021', '0', 'ABC_abcd1234'),
+            self.sheet_row('GB020', '1', 'DEF_abcd1234'),
+            self.sheet_row('GB021', '1', 'DEF_abcd1234'),
+            self.sheet_row('GB021', '0', 'GHI_abcd1234'),
+            self.sheet_row('GB022', '?', 'GHI_abcd1234'),
+        ]
+        expected = [
+            # Agreeing values:
+            self.conflict_row('GB020', '1', False, 'ABC_abcd1234'),
+            self.conflict_row('GB020', '1', False, 'DEF_abcd1234'),
+            # Conflicting values - all rows for the feature are marked:
+            self.conflict_row('GB021', '0', True, 'ABC_abcd1234'),
+            self.conflict_row('GB021', '1', True, 'DEF_abcd1234'),
+            self.conflict_row('GB021', '0', True, 'GHI_abcd1234'),
+            # A feature coded in one sheet only:
+            self.conflict_row('GB022', '?', False, 'GHI_abcd1234'),
+        ]
+        new_conflicts = c.make_conflict_sheet([], sheet_rows)
+        self.assertEqual(new_conflicts, expected)
+
+        # Merging the same sheets again does not change the conflict sheet:
+        sheet_rows = [
+            self.sheet_row(r['Feature_ID'], r['Value'], r['Sheet']) for r in new_conflicts]
+        self.assertEqual(c.make_conflict_sheet(new_conflicts, sheet_rows), expected)
+
+
 class ConflictChecks(unittest.TestCase):
 
     def test_happy_path(self):
@@ -0,0 +1,22 @@
+from pygrambank.dependencies import Rule, check_dependencies
+
+
+def test_check_dependencies():
+    index = {
+        ('GB408', '0'): {'a', 'b', 'c'},
+        ('GB409', '0'): {'a', 'b'},
+        ('GB410', '0'): {'a'},
+        ('GB022', '1'): {'b', 'c'},
+        ('GB023', '1'): {'b', 'c'},
+    }
+    commented = {'GB022': {'b', 'c'}, 'GB023': {'c'}}
+    res = check_dependencies(index, commented)
+    assert res['a'] == ["GB408, GB409, and GB410 can't all be 0"]
+    assert res['b'] == ['GB023 must have a comment if GB022 and GB023 are both 1']
+    assert 'c' not in res
+
+
+def test_custom_rules():
+    rules = [Rule([('GB020', '1')], 'GB020 is 1', ['GB020', 'GB021'])]
+    res = check_dependencies({('GB020', '1'): {'a'}}, {'GB020': {'a'}}, rules=rules)
+    assert res == {'a': ['GB021 must have a comment if GB020 is 1']}
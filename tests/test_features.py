@@ -1,3 +1,10 @@
+import shutil
+import pathlib
+
+from pygrambank.api import Grambank
+from pygrambank.features import GB20
+
+
 def test_gb20_update(api):
     def visit(f, api):
         f['xyz'] = 'abcdefg'
@@ -7,3 +14,57 @@ def test_gb20_update(api):
     new = (api.repos / 'gb20.txt').read_text(encoding='utf-8')
     assert 'xyz' in new
     assert 'abcdefg' in new
+
+
+def test_Features(repos, wiki, mocker):
+    read_text = mocker.spy(pathlib.Path, 'read_text')
+    features = Grambank(repos, wiki=wiki).features
+    assert 'GB020' in features and len(features) == len(list(features))
+    assert features['GB020'].domain
+    assert not any(c.args[0].suffix == '.md' for c in read_text.call_args_list)
+    assert features['GB020'].wiki['Patron']
+    assert any(c.args[0].suffix == '.md' for c in read_text.call_args_list)
+    assert features['GB020'].wiki_mismatches() == []
+
+
+def test_Features_multistate(tmp_path):
+    wiki = tmp_path / 'wiki'
+    wiki.mkdir()
+    gb20 = tmp_path / 'gb20.txt'
+    gb20.write_text(
+        'Grambank ID: GB024\nPossible Values: 1: a, 2: b, 3: both\n\n\n\n'
+        'Grambank ID: GB024a\nPossible Values: 0: no, 1: yes\nMultistate_parent: GB024\n',
+        encoding='utf8')
+    wiki.joinpath('GB024.md').write_text(
+        '# Title\n\n## Summary\n\nsummary\n\n## Patron\n\nHedvig\n', encoding='utf8')
+    features = GB20(gb20).read_features(wiki)
+    assert list(features) == ['GB024', 'GB024a']
+    assert features['GB024a'].wiki['Summary'] == 'summary'
+    assert features['GB024a'].patrons == ['HS']
+
+
+def test_feature_catalogue(repos, wiki, mocker):
+    api = Grambank(repos, wiki=wiki, cache=True)
+    catalogue = api.feature_catalogue()
+    assert list(catalogue) == list(Grambank(repos, wiki=wiki).features)
+
+    read_text = mocker.spy(pathlib.Path, 'read_text')
+    features = api.features
+    assert features['GB020'].wiki['Patron']
+    assert not any(
+        c.args[0].name in ('gb20.txt', 'GB020.md') for c in read_text.call_args_list)
+    assert [dict(f) for f in features.values()] == \
+        [dict(f) for f in Grambank(repos, wiki=wiki).features.values()]
+
+    # Changing the wiki invalidates the catalogue:
+    wiki.joinpath('GB020.md').write_text(
+        '# Title\n\n## Patron\n\nHedvig\n', encoding='utf8')
+    assert Grambank(repos, wiki=wiki, cache=True).features['GB020'].patrons == ['HS']
+    # ... and the outdated catalogue is removed:
+    assert len(list(api.cache_dir.joinpath('features').glob('*.pickle'))) == 1
+
+    # Without cache, the catalogue is not written:
+    api = Grambank(repos, wiki=wiki)
+    shutil.rmtree(str(api.cache_dir))
+    assert list(api.feature_catalogue()) == list(catalogue)
+    assert not api.cache_dir.exists()
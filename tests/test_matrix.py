@@ -0,0 +1,83 @@
+from pygrambank.sheet import Row
+from pygrambank.dependencies import check_feature_dependencies
+from pygrambank.matrix import ValueMatrix, StringTable, MISSING, UNKNOWN
+
+
+def test_StringTable():
+    t = StringTable()
+    assert t.add(None) == t.add('') == 0
+    assert t.add('a') == t.add('a') == 1
+    assert t[1] == 'a' and len(t) == 2
+
+
+def test_value_matrix(api):
+    m = api.value_matrix()
+    assert m.shape == (1, len(api.features))
+    assert m['abcd1234', 'GB020'] == '?'
+    assert m.code('abcd1234', 'GB020') == UNKNOWN
+    assert m.source('abcd1234', 'GB020') == 'Author 2020'
+    assert m['abcd1234', 'GB021'] is None
+    assert m.value_counts('GB021') == {MISSING: 1}
+    assert m.coverage()['GB020'] == 0
+
+
+def test_ValueMatrix_check_dependencies(mocker):
+    def sheet(gc, **values):
+        return (
+            mocker.Mock(glottocode=gc),
+            [dict(Feature_ID=k, Value=v, Source='x', Comment='') for k, v in values.items()])
+
+    m = ValueMatrix.from_sheets(
+        [
+            sheet('abcd1234', GB408='0', GB409='0', GB410='0'),
+            sheet('bcde1234', GB408='0', GB409='0', GB410='1'),
+        ],
+        ['GB408', 'GB409', 'GB410'])
+    assert m.coverage() == {'GB408': 2, 'GB409': 2, 'GB410': 2}
+    assert m.value_counts('GB410') == {0: 1, 1: 1}
+    assert m.check_dependencies() == {'abcd1234': ["GB408, GB409, and GB410 can't all be 0"]}
+
+
+def test_ValueMatrix_duplicate_feature(mocker):
+    # GB026 is coded twice - the last value takes precedence, for the matrix as for `check`:
+    rows = [
+        dict(Feature_ID='GB026', Value='0', Source='x', Comment=''),
+        dict(Feature_ID='GB026', Value='1', Source='x', Comment='comment'),
+    ]
+    m = ValueMatrix.from_sheets([(mocker.Mock(glottocode='abcd1234'), rows)], ['GB026'])
+    assert m['abcd1234', 'GB026'] == '1'
+    assert m.comment('abcd1234', 'GB026') == 'comment'
+    assert m.check_dependencies() == {}
+    assert check_feature_dependencies(Row.from_dict(r) for r in rows) == []
+
+    # Without comment for the last value, both report the missing comment:
+    rows.reverse()
+    rows[0]['Value'], rows[1]['Value'] = '0', '1'
+    m = ValueMatrix.from_sheets([(mocker.Mock(glottocode='abcd1234'), rows)], ['GB026'])
+    errors = check_feature_dependencies(Row.from_dict(r) for r in rows)
+    assert errors and m.check_dependencies() == {'abcd1234': errors}
+
+
+def test_ValueMatrix_dump_load(api, tmp_path):
+    m = api.value_matrix()
+    m.dump(tmp_path / 'values.bin')
+    loaded = ValueMatrix.load(tmp_path / 'values.bin')
+    assert loaded.shape == m.shape
+    assert list(loaded.values) == list(m.values)
+    assert loaded.source('abcd1234', 'GB020') == 'Author 2020'
+    assert loaded.comment('abcd1234', 'GB020') == ''
+    assert loaded.value_counts('GB020') == m.value_counts('GB020')
+
+
+def test_value_matrix_conflicts(api, tmp_path):
+    api.quarantine_dir.mkdir()
+    api.sheets_dir.joinpath('ABBR_abcd1234.tsv').rename(
+        api.quarantine_dir / 'ABBR_abcd1234.tsv')
+    conflicts = tmp_path / 'conflicts'
+    conflicts.mkdir()
+    conflicts.joinpath('abcd1234.tsv').write_text(
+        'Feature_ID\tValue\tConflict\tSelect\tSheet\n'
+        'GB020\t?\tFalse\t\tABBR_abcd1234\n',
+        encoding='utf8')
+    m = api.value_matrix(conflicts_dir=conflicts)
+    assert m['abcd1234', 'GB020'] == '?'
@@ -1,4 +1,6 @@
+import pickle
 import pathlib
+import collections
 import unittest
 
 import pytest
@@ -39,6 +41,28 @@ def test_check(api, sheet_abbr, sheet_factory, capsys):
            sheet.Sheet(api.sheets_dir / 'NOVALS_abcd1234.tsv').check(api)
 
 
+def test_check_single_pass(api, sheet_factory, mocker, capsys):
+    s = sheet_factory("""Feature_ID\tValue\tSource\tComment\t
+GB020\t1\tx\t\tnote
+GB021\t0\tx\t\t
+GB020\t0\tx\tcheck\t
+""")
+    reader = mocker.spy(s, '_reader')
+    validate = mocker.spy(s, '_validate_row')
+    report = []
+    assert s.check(api, report=report) == 2
+    assert reader.call_count == 1 and validate.call_count == 3
+    assert [msg[1:] for msg in report] == [
+        ['WARNING', '1', '', 'non-empty cell with empty header: note'],
+        ['ERROR', '4', 'GB020', 'comment contains string "check"'],
+        ['ERROR', '4', 'GB020', 'duplicate value for feature GB020'],
+        ['WARNING', '?', '', 'Less than 25 datapoints have comments'],
+        ['ERROR', '?', '', "inconsistent multiple codings: ['1', '0']"],
+    ]
+    # The rows read during the check are re-used:
+    assert len(list(s.iterrows())) == 3 and reader.call_count == 1
+
+
 class FeatureDependencies(unittest.TestCase):
 
     def row(self, feature_id, value, comment=None):
@@ -373,3 +397,84 @@ def test_valid_row(sheet_abbr, api, mocker, row, logs):
     log = mocker.Mock()
     assert not sheet_abbr.valid_row(row, api, log=log)
     assert (not logs) or log.called
+
+
+@pytest.mark.parametrize(
+    'comment,flagged',
+    [
+        ('Please CHECK this', True),
+        ('checked by coder', False),
+        ('Checked by GB coder', False),
+        ('HG: check', False),
+        ('wrong import, check', False),
+        ('no problem', False),
+    ]
+)
+def test_ValidationTable_is_check_comment(comment, flagged):
+    assert sheet.ValidationTable.is_check_comment(comment) == flagged
+
+
+def test_ValidationTable(api):
+    table = api.validation_table
+    assert table.is_valid_feature_id('GB020')
+    assert table.is_valid_feature_id('GB999')
+    assert not table.is_valid_feature_id('XX056')
+    assert table.domains['GB021'] == frozenset(api.features['GB021'].domain)
+    with pytest.raises(TypeError):
+        table.domains['GB021'] = frozenset()
+
+
+def test_SheetRow():
+    header = sheet.Header(['Feature_ID', 'Value', 'Value', ''])
+    assert header.keys == ('Feature_ID', 'Value', '')
+    row = sheet.SheetRow.from_list(header, ['GB020', '1', '0', 'x', 'surplus'])
+    assert row == collections.OrderedDict(
+        [('Feature_ID', 'GB020'), ('Value', '0'), ('', 'x'), (None, ['surplus'])])
+    short = sheet.SheetRow.from_list(header, ['GB020'])
+    assert short['Value'] is None and short.get('Source') is None and 'Source' not in short
+    assert short['Feature_ID'] is row['Feature_ID']
+
+    row['Value'] = '?'
+    row['Source'] = 'Meier 2000'
+    row.update(Comment='comment')
+    del row[None]
+    assert list(row.items()) == [
+        ('Feature_ID', 'GB020'), ('Value', '?'), ('', 'x'),
+        ('Source', 'Meier 2000'), ('Comment', 'comment')]
+    assert short['Value'] is None and len(short) == 3
+    assert pickle.loads(pickle.dumps(row)) == row
+
+
+def test_Row_contributed_datapoint():
+    row = sheet.Row.from_dict({
+        'Feature_ID': 'GB020', 'Value': '1', 'Source': '', 'Contributed Datapoints': 'AB, CD'})
+    assert row._contributed_datapoint == 'AB, CD'
+    assert row == sheet.Row('GB020', '1', '', contributed_datapoint=['AB', 'CD'])
+    assert row.contributed_datapoint == ['AB', 'CD']
+    row.contributed_datapoint = ['EF']
+    assert row.contributed_datapoint == ['EF']
+    assert sheet.Row('GB020', '1', '').contributed_datapoint == []
+
+
+def test_iterrows_columns(api, sheet_factory, mocker):
+    s = sheet_factory("""Feature\tFeature_ID\tValue\tSource\tComment\tContributed Datapoints\tx
+Some feature\tGB020\t1\tx\t\tAB CD\ty\tsurplus
+""")
+    reader = mocker.spy(s, '_reader')
+    rows = list(s.iterrows(columns=sheet.VALUE_COLUMNS))
+    assert list(rows[0].items()) == [
+        ('Feature_ID', 'GB020'), ('Value', '1'), ('Source', 'x'), ('Comment', ''),
+        ('Contributed Datapoints', 'AB CD')]
+    assert sheet.Row.from_dict(rows[0]).contributed_datapoint == ['AB', 'CD']
+    # Projected rows are not kept:
+    assert len(list(s.iterrows())[0]) == 8 and reader.call_count == 2
+    # Rows which have been read in full are projected:
+    assert list(s.iterrows(columns=['Value', 'Missing'])) == [{'Value': '1'}]
+    assert reader.call_count == 2
+
+    s = sheet.Sheet(s.path, columns=['Feature_ID'])
+    assert list(s.iterrows()) == [{'Feature_ID': 'GB020'}]
+    # Visiting a sheet always operates on the full rows:
+    assert s.visit() == (1, 1)
+    assert s.path.read_text(encoding='utf8').splitlines()[0].split('\t') == [
+        'Feature', 'Feature_ID', 'Value', 'Source', 'Comment', 'Contributed Datapoints', 'x', '']
@@ -0,0 +1,63 @@
+import pickle
+import collections
+
+import pytest
+
+from pygrambank.tree import TreeIndex, DescendantsMap, InheritedBibkeys
+
+# A tree given as (glottocode, parent) pairs, with parents preceding their children - but not in
+# pre-order:
+PARENTS = [
+    ('fam1', None),
+    ('fam2', None),
+    ('sub1', 'fam1'),
+    ('lang', 'fam2'),
+    ('lan1', 'sub1'),
+    ('lan2', 'sub1'),
+    ('dia1', 'lan1'),
+    ('orph', 'miss'),
+]
+
+
+@pytest.fixture
+def tree():
+    return TreeIndex.from_parents(PARENTS)
+
+
+def test_TreeIndex(tree):
+    assert tree.glottocodes == ['fam1', 'sub1', 'lan1', 'dia1', 'lan2', 'fam2', 'lang', 'orph']
+    assert len(tree) == 8 and 'dia1' in tree and 'miss' not in tree
+    assert tree.descendants('sub1') == ['sub1', 'lan1', 'dia1', 'lan2']
+    assert tree.descendants('lan2') == ['lan2']
+    assert tree.is_descendant('dia1', 'fam1') and tree.is_descendant('fam1', 'fam1')
+    assert not tree.is_descendant('lang', 'fam1') and not tree.is_descendant('fam1', 'sub1')
+    assert [tree.glottocodes[i] for i in tree.ancestry(tree.ids['dia1'])] == \
+        ['dia1', 'lan1', 'sub1', 'fam1']
+
+
+def test_DescendantsMap(tree):
+    descendants = collections.defaultdict(list)
+    for gc, _ in PARENTS:
+        descendants[gc].append(gc)
+        parent = dict(PARENTS)[gc]
+        while parent in dict(PARENTS):
+            descendants[parent].append(gc)
+            parent = dict(PARENTS)[parent]
+    assert {k: sorted(v) for k, v in DescendantsMap(tree).items()} == \
+        {k: sorted(v) for k, v in descendants.items()}
+
+
+def test_InheritedBibkeys(tree):
+    bibkeys = InheritedBibkeys(tree)
+    bibkeys.add('sub1', 'a')
+    bibkeys.add('lan1', 'b')
+    bibkeys.add('dia1', 'a')
+    bibkeys.add('lang', 'c')
+
+    assert bibkeys['dia1'] == {'a', 'b'}
+    assert bibkeys['lan2'] == {'a'}
+    assert bibkeys['fam1'] == set() and bibkeys['unknown'] == set()
+    assert bibkeys.get('fam1') is None and 'fam1' not in bibkeys and 'lan2' in bibkeys
+    assert list(bibkeys) == ['sub1', 'lan1', 'dia1', 'lan2', 'lang'] and len(bibkeys) == 5
+    assert pickle.loads(pickle.dumps(bibkeys)) == bibkeys == {
+        'sub1': {'a'}, 'lan1': {'a', 'b'}, 'dia1': {'a', 'b'}, 'lan2': {'a'}, 'lang': {'c'}}
@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from pygrambank import util
@@ -15,3 +17,47 @@ from pygrambank import util
 def test_write_tsv(api, tmp_path, fname, nrows):
     assert nrows == util.write_tsv(
         api.path('obsolete_sheets', fname), tmp_path / 't.tsv', 'abcd1234')
+
+
+def test_iter_xlsx_wrong_dimension(tmp_path):
+    import zipfile
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['Feature_ID', 'Value', 'Source', 'Comment'])
+    ws.append(['GB020', '1', 'Meier 2000', 'comment'])
+    wb.save(str(tmp_path / 'test.xlsx'))
+
+    # Rewrite the workbook with a dimension tag claiming the sheet has only one cell:
+    with zipfile.ZipFile(str(tmp_path / 'test.xlsx')) as zin:
+        with zipfile.ZipFile(str(tmp_path / 'wrong.xlsx'), 'w') as zout:
+            for item in zin.infolist():
+                data = zin.read(item.filename)
+                if item.filename == 'xl/worksheets/sheet1.xml':
+                    data = re.sub(b'<dimension ref="[^"]+"', b'<dimension ref="A1"', data)
+                    assert b'<dimension ref="A1"' in data
+                zout.writestr(item, data)
+
+    rows = list(util.iter_xlsx(tmp_path / 'wrong.xlsx'))
+    assert len(rows) == 1
+    assert rows[0]['Comment'] == 'comment'
+
+
+def test_iter_xlsx_bloated(tmp_path):
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(['Feature_ID', 'Value', 'Source', 'Comment', ''] + [
+        'Column{}'.format(i) for i in range(1, 100)])
+    ws.append(['GB020', '1', 'Meier 2000', 'comment'])
+    for _ in range(1100):
+        ws.append([])
+    ws.append(['GB021', '1', 'Meier 2000'])
+    wb.save(str(tmp_path / 'test.xlsx'))
+
+    rows = list(util.iter_xlsx(tmp_path / 'test.xlsx'))
+    assert len(rows) == 1
+    assert rows[0]['Comment'] == 'comment'
+    assert not any(k.startswith('Column') for k in rows[0])